@@ -6,6 +6,7 @@ This module defines the v1 endpoints for carousel generation and management.
 
 import logging
 import os
+import secrets
 import time
 import uuid
 from typing import Any, Dict, List, Tuple
@@ -97,12 +98,12 @@ async def generate_carousel(
 
     try:
         # Create a unique ID for this carousel
-        carousel_id = str(uuid.uuid4())[:8]
+        carousel_id = secrets.token_hex(4)
         request_logger.info(f"Assigned carousel ID: {carousel_id}")
 
         # Check for potentially problematic characters in text
         for i, slide in enumerate(request.slides):
-            if any(ord(c) > 127 for c in slide.text):
+            if not slide.text.isascii():
                 warnings.append(
                     f"Slide {i + 1} contains non-ASCII characters which may not render correctly"
                 )
@@ -356,7 +357,7 @@ async def _generate_carousel_content(
 ) -> Tuple[str, List[Dict[str, Any]]]:
     """Generate carousel images based on request data."""
     # Create a unique ID for this carousel
-    carousel_id = str(uuid.uuid4())[:8]
+    carousel_id = secrets.token_hex(4)
     logger.info(f"Starting carousel generation with URLs for ID: {carousel_id}")
 
     # Generate carousel images
@@ -549,10 +550,10 @@ async def debug_temp(
 
     # List all carousel directories
     try:
-        for carousel_id in os.listdir(temp_dir):
-            carousel_path = temp_dir / carousel_id
-            if carousel_path.is_dir():
-                contents[carousel_id] = os.listdir(carousel_path)
+        with os.scandir(temp_dir) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    contents[entry.name] = os.listdir(entry.path)
 
         result = {
             "temp_dir": str(temp_dir),
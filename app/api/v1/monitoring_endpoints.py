@@ -18,7 +18,7 @@ from fastapi.responses import HTMLResponse, Response
 
 from app.api.security import get_api_key
 from app.core.config import settings
-from app.services.storage_service import StorageService
+from app.services.storage_service import StorageService, get_default_storage_service
 
 # Set up router
 router = APIRouter(prefix="/monitoring", tags=["monitoring"])
@@ -482,18 +482,20 @@ def count_carousels(storage_service: Optional[StorageService] = None) -> int:
     try:
         # Get storage service if not provided
         if storage_service is None:
-            # Create a new service instance
-            storage_service = StorageService()
+            # Use the shared service instance
+            storage_service = get_default_storage_service()
 
         # Get the temp directory
         temp_dir = storage_service.temp_dir
 
         # Count directories that look like carousel IDs (excluding hidden directories)
-        count = sum(
-            1
-            for item in os.listdir(temp_dir)
-            if os.path.isdir(os.path.join(temp_dir, item)) and not item.startswith(".")
-        )
+        # DirEntry carries the file type from readdir, so no per-entry stat is needed
+        with os.scandir(temp_dir) as entries:
+            count = sum(
+                1
+                for entry in entries
+                if not entry.name.startswith(".") and entry.is_dir(follow_symlinks=False)
+            )
 
         return count
     except Exception as e:
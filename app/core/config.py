@@ -50,6 +50,10 @@ class Settings(BaseSettings):
         default_factory=lambda: int(os.getenv("PORT", "5001")),
         description="Server port",
     )
+    WORKERS: int = Field(
+        default_factory=lambda: int(os.getenv("WORKERS", "1")),
+        description="Number of uvicorn worker processes when not in debug mode",
+    )
     PRODUCTION: bool = Field(
         default_factory=lambda: os.getenv("PRODUCTION", "").lower() == "true",
         description="Flag indicating if the app is running in production mode",
@@ -12,7 +12,7 @@ from app.core.service_provider import ServiceProvider, get_service_provider
 
 # Import service interfaces and implementations
 from app.services.image_service import BaseImageService, ImageServiceType, get_image_service
-from app.services.storage_service import StorageService, storage_service
+from app.services.storage_service import StorageService, get_default_storage_service
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -30,8 +30,8 @@ def register_services():
     provider = get_service_provider()
     logger.info("Registering application services...")
 
-    # Register Storage Service
-    provider.register_instance(StorageService, storage_service)
+    # Register Storage Service (instantiated lazily on first request)
+    provider.register(StorageService, get_default_storage_service, singleton=True)
 
     # Register Image Service configurations
     register_image_services(provider)
@@ -1,7 +1,7 @@
 """Services package for Instagram Carousel Generator."""
-from .storage_service import StorageService, storage_service
+from .storage_service import StorageService, get_default_storage_service
 
 __all__ = [
     "StorageService",
-    "storage_service",
+    "get_default_storage_service",
 ]
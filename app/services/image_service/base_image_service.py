@@ -5,19 +5,303 @@ This module provides the abstract base class and common functionality for
 image service implementations, which handle the creation of carousel images
 with consistent styling.
 """
+import functools
+import io
 import logging
 import os
-import tempfile
+import re
 import time
 import unicodedata
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageChops, ImageDraw, ImageFont
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Resolve the resampling filter once (Pillow >= 9.1 moved it to Image.Resampling)
+_LANCZOS = getattr(Image, "Resampling", Image).LANCZOS
+
+
+# Characters that commonly fail to render, mapped to ASCII stand-ins.
+# Built once so sanitizing is a single str.translate pass.
+SPECIAL_CHAR_REPLACEMENTS = str.maketrans(
+    {
+        "\u2192": "->",  # Right arrow
+        "\u2190": "<-",  # Left arrow
+        "\u2191": "^",  # Up arrow
+        "\u2193": "v",  # Down arrow
+        "\u2018": "'",  # Left single quote
+        "\u2019": "'",  # Right single quote
+        "\u201C": '"',  # Left double quote
+        "\u201D": '"',  # Right double quote
+        "\u2013": "-",  # En dash
+        "\u2014": "-",  # Em dash
+        "\u2026": "...",  # Ellipsis
+    }
+)
+
+# Any character outside the 7-bit ASCII range
+_NON_ASCII_RE = re.compile(r"[^\x00-\x7f]")
+
+# Common system fonts tried, in order, when a requested font cannot be loaded
+FALLBACK_FONTS = (
+    "Arial.ttf",
+    "DejaVuSans.ttf",
+    "FreeSans.ttf",
+    "LiberationSans-Regular.ttf",
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_truetype(font_path: str, size: int) -> ImageFont.FreeTypeFont:
+    """
+    Load a TrueType font once per (path, size) and reuse it across slides.
+
+    Font objects are read-only after loading, so sharing them between calls
+    (and threads) is safe. Failed loads raise and are therefore not cached.
+    """
+    return ImageFont.truetype(font_path, size)
+
+
+def _renderable_or_placeholder(match: "re.Match[str]") -> str:
+    """Keep a non-ASCII character from a renderable category, else return '?'."""
+    char = match.group()
+    # Letter, Number, Punctuation, Symbol, Separator
+    return char if unicodedata.category(char)[0] in "LNPSZ" else "?"
+
+
+def filter_unrenderable_chars(text: str) -> str:
+    """
+    Replace non-ASCII characters outside renderable Unicode categories with '?'.
+
+    The compiled pattern skips ASCII runs in C, so Python only handles the
+    non-ASCII characters themselves.
+
+    Args:
+        text: The text to filter
+    Returns:
+        Filtered text
+    """
+    if text.isascii():
+        return text
+    return _NON_ASCII_RE.sub(_renderable_or_placeholder, text)
+
+
+@functools.lru_cache(maxsize=8)
+def _blank_canvas(width: int, height: int, bg_color: Any) -> Image.Image:
+    """
+    Return a shared, filled background template for a slide size and color.
+
+    Callers must copy() it; copying is a straight memcpy, about twice as fast
+    as filling a fresh image.
+    """
+    return Image.new("RGBA", (width, height), bg_color)
+
+
+# Longest text kept in the sanitize cache. Titles and short strings repeat and
+# are worth memoizing; slide bodies are long, rarely repeat and would otherwise
+# pin up to a thousand full user texts in memory
+MAX_CACHED_SANITIZE_CHARS = 256
+
+
+def _sanitize_text(text: str, ascii_only: bool) -> str:
+    """Replace problematic characters and NFKD-normalize text."""
+    # Replace specific problematic characters
+    text = text.translate(SPECIAL_CHAR_REPLACEMENTS)
+    # Normalize Unicode (NFKD = compatibility decomposition)
+    text = unicodedata.normalize("NFKD", text)
+    # Keep only ASCII characters if specified in settings
+    if ascii_only:
+        text = text.encode("ascii", "ignore").decode("ascii")
+    return text
+
+
+@functools.lru_cache(maxsize=1024)
+def _sanitize_text_cached(text: str, ascii_only: bool) -> str:
+    """
+    Sanitize text, memoized per input.
+
+    Titles and short strings repeat across slides and regenerations, so the
+    normalization pass is skipped for anything seen recently.
+    """
+    return _sanitize_text(text, ascii_only)
+
+
+@functools.lru_cache(maxsize=64)
+def load_font(
+    font_path: str, size: int, fallback_size: Optional[int] = None
+) -> ImageFont.FreeTypeFont:
+    """
+    Resolve a font request, including its fallbacks, once per argument set.
+
+    Caching the resolved result means a missing font is only probed (and
+    warned about) on the first request rather than on every slide.
+
+    Args:
+        font_path: Path to the font file
+        size: Desired font size
+        fallback_size: Optional alternative size for fallback fonts
+    Returns:
+        Loaded font, a system fallback, or Pillow's default font
+    """
+    try:
+        return _cached_truetype(font_path, size)
+    except (IOError, OSError) as e:
+        logger.warning(f"Could not load font {font_path} at size {size}: {e}")
+        try:
+            # Try loading a common system font
+            for system_font in FALLBACK_FONTS:
+                try:
+                    return _cached_truetype(
+                        system_font,
+                        size if fallback_size is None else fallback_size,
+                    )
+                except Exception as e:
+                    logger.error(f"Error with text fallback {e}")
+                    continue
+            # If all else fails, use default
+            return ImageFont.load_default()
+        except Exception as e:
+            logger.error(f"Failed to load any substitute font: {e}")
+            return ImageFont.load_default()
+
+
+@functools.lru_cache(maxsize=128)
+def _gradient_row(colors: Tuple[Tuple[int, int, int], ...], width: int) -> bytes:
+    """
+    Compute one row of gradient brightness values, cached per palette and width.
+
+    Slides in a carousel share a palette, and titles often share a width.
+    """
+    (r0, g0, b0), (r1, g1, b1) = colors[0], colors[1]
+    return bytes(
+        int((int(r0 + t * (r1 - r0)) + int(g0 + t * (g1 - g0)) + int(b0 + t * (b1 - b0))) / 3)
+        for t in (i / width for i in range(width))
+    )
+
+
+def build_gradient_mask(
+    width: int, height: int, colors: Tuple[Tuple[int, int, int], ...]
+) -> Image.Image:
+    """
+    Build an "L" mask whose brightness ramps from the first color to the second.
+
+    Args:
+        width: Width of the mask
+        height: Height of the mask
+        colors: (r, g, b) tuples for gradient start and end
+    Returns:
+        PIL Image in "L" mode
+    """
+    if width <= 0 or height <= 0:
+        return Image.new("L", (max(width, 0), max(height, 0)), color=0)
+
+    row = _gradient_row(tuple(map(tuple, colors[:2])), width)
+
+    # Compute the ramp once as a single row and let Pillow stretch it in C
+    # rather than drawing one line per column
+    return Image.frombytes("L", (width, 1), row).resize((width, height), Image.NEAREST)
+
+
+# Largest render kept in the title cache (raw RGBA bytes). The height grows with
+# title length, so larger renders are rebuilt on every call rather than cached,
+# keeping long user-supplied titles from pinning megabytes each
+MAX_CACHED_RENDER_BYTES = 512 * 1024
+
+
+def _rasterize_gradient_text(
+    text: str,
+    font: ImageFont.FreeTypeFont,
+    width: int,
+    height: int,
+    colors: Tuple[Tuple[int, int, int], ...],
+) -> Image.Image:
+    """Rasterize white text faded by a gradient into an RGBA image."""
+    # Rasterize glyph coverage straight into a single-channel image; it equals
+    # the alpha that white text on a transparent RGBA canvas would get
+    coverage = Image.new("L", (width, height), color=0)
+    ImageDraw.Draw(coverage).text((0, 0), text, font=font, fill=255)
+
+    # Scale the glyphs' anti-aliased coverage by the gradient instead of
+    # replacing it, so edges stay smooth and the background stays transparent
+    text_img = Image.new("RGBA", (width, height), color=(255, 255, 255, 0))
+    text_img.putalpha(ImageChops.multiply(coverage, build_gradient_mask(width, height, colors)))
+    return text_img
+
+
+@functools.lru_cache(maxsize=32)
+def _render_gradient_text(
+    text: str,
+    font: ImageFont.FreeTypeFont,
+    width: int,
+    height: int,
+    colors: Tuple[Tuple[int, int, int], ...],
+) -> Tuple[bytes, Tuple[int, int]]:
+    """Render gradient text once per argument set and return its raw RGBA bytes."""
+    text_img = _rasterize_gradient_text(text, font, width, height, colors)
+    return text_img.tobytes(), text_img.size
+
+
+def render_gradient_text_image(
+    text: str,
+    font: ImageFont.FreeTypeFont,
+    width: int,
+    height: int,
+    colors: List[Tuple[int, int, int]],
+) -> Image.Image:
+    """
+    Render gradient text, reusing a previous render of the same title when possible.
+
+    Titles repeat across retries and regenerations, so the rendered pixels are
+    cached on (text, font, size, colors) and a fresh image is rebuilt from the
+    cached bytes on every call. Renders larger than MAX_CACHED_RENDER_BYTES
+    bypass the cache.
+
+    Args:
+        text: Text to render
+        font: Font to use
+        width: Width of the text image
+        height: Height of the text image
+        colors: List of (r, g, b) tuples for gradient start and end
+    Returns:
+        PIL Image in "RGBA" mode
+    """
+    key_colors = tuple(tuple(color) for color in colors[:2])
+    if width * height * 4 > MAX_CACHED_RENDER_BYTES:
+        return _rasterize_gradient_text(text, font, width, height, key_colors)
+    data, size = _render_gradient_text(text, font, width, height, key_colors)
+    return Image.frombytes("RGBA", size, data)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_resized_logo(logo_path: str, size: int, mtime: float) -> Image.Image:
+    """Decode and resize a logo once per (path, size, modification time)."""
+    with Image.open(logo_path) as logo:
+        return logo.convert("RGBA").resize((size, size), _LANCZOS)
+
+
+def load_logo(logo_path: str, size: int) -> Image.Image:
+    """
+    Load a logo as a square RGBA image, reusing the decoded result across slides.
+
+    The file's modification time is part of the cache key, so replacing the
+    logo on disk is picked up on the next call. The returned image is shared
+    and must be treated as read-only.
+
+    Args:
+        logo_path: Path to the logo file
+        size: Width and height of the resized logo
+    Returns:
+        PIL Image in "RGBA" mode
+    """
+    return _load_resized_logo(logo_path, size, os.path.getmtime(logo_path))
+
 
 class ImageServiceError(Exception):
     """Base exception class for image service errors."""
@@ -71,28 +355,10 @@ class BaseImageService(ABC):
         # Convert to string if not already
         if not isinstance(text, str):
             text = str(text)
-        # Replace specific problematic characters
-        replacements = {
-            "\u2192": "->",  # Right arrow
-            "\u2190": "<-",  # Left arrow
-            "\u2191": "^",  # Up arrow
-            "\u2193": "v",  # Down arrow
-            "\u2018": "'",  # Left single quote
-            "\u2019": "'",  # Right single quote
-            "\u201C": '"',  # Left double quote
-            "\u201D": '"',  # Right double quote
-            "\u2013": "-",  # En dash
-            "\u2014": "-",  # Em dash
-            "\u2026": "...",  # Ellipsis
-        }
-        for char, replacement in replacements.items():
-            text = text.replace(char, replacement)
-        # Normalize Unicode (NFKD = compatibility decomposition)
-        text = unicodedata.normalize("NFKD", text)
-        # Keep only ASCII characters if specified in settings
-        if self.settings.get("ascii_only", False):
-            text = "".join(c for c in text if ord(c) < 128)
-        return text
+        ascii_only = bool(self.settings.get("ascii_only", False))
+        if len(text) > MAX_CACHED_SANITIZE_CHARS:
+            return _sanitize_text(text, ascii_only)
+        return _sanitize_text_cached(text, ascii_only)
 
     def safe_load_font(
         self, font_path: str, size: int, fallback_size: Optional[int] = None
@@ -109,31 +375,56 @@ class BaseImageService(ABC):
         Raises:
             FontLoadError: If font cannot be loaded
         """
+        return load_font(font_path, size, fallback_size)
+
+    def _create_canvas(self, width: int, height: int, bg_color) -> Image.Image:
+        """
+        Create an opaque RGBA slide canvas so overlays can be alpha-composited.
+
+        Args:
+            width: Canvas width
+            height: Canvas height
+            bg_color: Background color as an (r, g, b) sequence or a color string
+        Returns:
+            PIL Image in "RGBA" mode
+        """
+        if isinstance(bg_color, (tuple, list)):
+            bg_color = (*bg_color, 255) if len(bg_color) == 3 else tuple(bg_color)
+        return _blank_canvas(width, height, bg_color).copy()
+
+    def _composite(
+        self, image: Image.Image, overlay: Image.Image, position: Tuple[int, int]
+    ) -> None:
+        """
+        Blend an RGBA overlay onto an RGBA image in place.
+
+        Overlays that start above or left of the canvas are clipped, since
+        alpha_composite only accepts non-negative destinations.
+
+        Args:
+            image: Destination RGBA image
+            overlay: RGBA image to blend on top
+            position: Upper-left (x, y) of the overlay on the destination
+        """
+        x, y = int(position[0]), int(position[1])
+        image.alpha_composite(overlay, dest=(max(x, 0), max(y, 0)), source=(max(-x, 0), max(-y, 0)))
+
+    def _get_line_height(self, font, default: int = 60) -> int:
+        """
+        Get the line height for a font from its ascent and descent.
+
+        Args:
+            font: Font to measure
+            default: Line height to use when the font exposes no metrics
+        Returns:
+            Line height in pixels
+        """
         try:
-            return ImageFont.truetype(font_path, size)
-        except (IOError, OSError) as e:
-            logger.warning(f"Could not load font {font_path} at size {size}: {e}")
-            try:
-                # Try loading a common system font
-                for system_font in [
-                    "Arial.ttf",
-                    "DejaVuSans.ttf",
-                    "FreeSans.ttf",
-                    "LiberationSans-Regular.ttf",
-                ]:
-                    try:
-                        return ImageFont.truetype(
-                            system_font,
-                            size if fallback_size is None else fallback_size,
-                        )
-                    except Exception as e:
-                        logger.error(f"Error with text fallback {e}")
-                        continue
-                # If all else fails, use default
-                return ImageFont.load_default()
-            except Exception as e:
-                logger.error(f"Failed to load any substitute font: {e}")
-                return ImageFont.load_default()
+            ascent, descent = font.getmetrics()
+        except AttributeError:
+            # Bitmap fonts don't expose metrics
+            return default
+        return ascent + descent
 
     @abstractmethod
     def create_slide_image(
@@ -225,26 +516,23 @@ class BaseImageService(ABC):
         logger.info(f"Title: {carousel_title}")
         logger.info(f"Number of slides: {len(slides_data)}")
 
-        # Create a temporary directory for the images
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Generate slides
-            image_files = self._generate_all_slides(
-                carousel_title,
-                slides_data,
-                carousel_id,
-                include_logo,
-                logo_path,
-                temp_dir,
-            )
-
-            # Log performance metrics
-            generation_time = time.time() - start_time
-            logger.info(
-                f"Carousel generation completed in {generation_time:.2f} seconds with "
-                f"{len(image_files)} slides"
-            )
-
-            return image_files
+        # Generate slides; images are encoded in memory, so no temp files are needed
+        image_files = self._generate_all_slides(
+            carousel_title,
+            slides_data,
+            carousel_id,
+            include_logo,
+            logo_path,
+        )
+
+        # Log performance metrics
+        generation_time = time.time() - start_time
+        logger.info(
+            f"Carousel generation completed in {generation_time:.2f} seconds with "
+            f"{len(image_files)} slides"
+        )
+
+        return image_files
 
     def _generate_all_slides(
         self,
@@ -253,40 +541,66 @@ class BaseImageService(ABC):
         carousel_id: str,
         include_logo: bool,
         logo_path: str,
-        temp_dir: str,
     ) -> List[Dict[str, Any]]:
-        """Generate all slides for the carousel and store them in temporary directory."""
-        image_files = []
+        """Generate all slides for the carousel as encoded image data."""
         total_slides = len(slides_data)
 
-        # Generate each slide
-        for index, slide in enumerate(slides_data):
+        def generate(index: int) -> Dict[str, Any]:
             slide_number = index + 1
             try:
                 # Process this slide
                 slide_result = self._process_single_slide(
                     carousel_title if index == 0 else None,
                     # Only show title on first slide
-                    slide,
+                    slides_data[index],
                     slide_number,
                     total_slides,
                     include_logo,
                     logo_path,
-                    temp_dir,
                 )
-                image_files.append(slide_result)
                 logger.info(f"Slide {slide_number} generated successfully")
+                return slide_result
 
             except Exception as e:
                 # Handle errors per slide
                 logger.error(f"Error processing slide {slide_number}: {str(e)}")
-                error_result = self._create_error_slide_file(
-                    index + 1, total_slides, str(e), temp_dir
-                )
-                image_files.append(error_result)
+                error_result = self._create_error_slide_file(slide_number, total_slides, str(e))
                 logger.info(f"Error slide generated for slide {slide_number}")
+                return error_result
 
-        return image_files
+        return self._map_slides(generate, list(range(total_slides)))
+
+    def create_slides_batch(self, slide_specs: List[Dict[str, Any]]) -> List[Image.Image]:
+        """
+        Create several slides concurrently.
+
+        Each spec holds the keyword arguments for create_slide_image. Pillow
+        releases the GIL while rasterizing, so slides render in parallel threads.
+
+        Args:
+            slide_specs: List of keyword-argument dictionaries for create_slide_image
+        Returns:
+            List of PIL Image objects in the same order as slide_specs
+        """
+        return self._map_slides(lambda spec: self.create_slide_image(**spec), slide_specs)
+
+    def _map_slides(self, func: Callable[[T], R], items: List[T]) -> List[R]:
+        """
+        Apply func to every item using a thread pool, preserving order.
+
+        The first item is processed in the calling thread so that shared caches
+        (fonts, logo, gradient title) are populated before workers start.
+        """
+        if not items:
+            return []
+
+        results = [func(items[0])]
+        remaining = items[1:]
+        if remaining:
+            max_workers = min(os.cpu_count() or 1, len(remaining))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results.extend(executor.map(func, remaining))
+        return results
 
     def _process_single_slide(
         self,
@@ -296,7 +610,6 @@ class BaseImageService(ABC):
         total_slides: int,
         include_logo: bool,
         logo_path: str,
-        temp_dir: str,
     ) -> Dict[str, Any]:
         """Process and generate a single carousel slide."""
         # Get slide text
@@ -312,33 +625,30 @@ class BaseImageService(ABC):
         )
 
         # Create result dictionary
-        return self._save_slide_to_file(img, slide_number, temp_dir)
+        return self._encode_slide(img, slide_number)
 
     def _create_error_slide_file(
-        self, slide_number: int, total_slides: int, error_message: str, temp_dir: str
+        self, slide_number: int, total_slides: int, error_message: str
     ) -> Dict[str, Any]:
-        """Create an error slide and save it to file."""
+        """Create an error slide and encode it as slide data."""
         # Create an error slide
         error_img = self.create_error_slide(slide_number, total_slides, error_message)
 
         # Save as error slide
-        return self._save_slide_to_file(error_img, slide_number, temp_dir, is_error=True)
+        return self._encode_slide(error_img, slide_number, is_error=True)
 
-    def _save_slide_to_file(
-        self, img: Image.Image, slide_number: int, temp_dir: str, is_error: bool = False
+    def _encode_slide(
+        self, img: Image.Image, slide_number: int, is_error: bool = False
     ) -> Dict[str, Any]:
-        """Save a slide image to file and return the metadata."""
+        """Encode a slide image as PNG in memory and return the metadata."""
         # Determine filename
         filename_suffix = "_error" if is_error else ""
         filename = f"slide_{slide_number}{filename_suffix}.png"
 
-        # Save image
-        filepath = os.path.join(temp_dir, filename)
-        img.save(filepath)
-
-        # Read file and convert to hex
-        with open(filepath, "rb") as f:
-            file_content = f.read()
+        # Encode straight into a buffer rather than round-tripping through disk
+        buffer = io.BytesIO()
+        img.save(buffer, format="PNG")
+        file_content = buffer.getvalue()
 
         # Return metadata
         return {
@@ -7,16 +7,27 @@ user-friendly error displays for carousel images.
 """
 import logging
 import os
+import textwrap
 import traceback
 import unicodedata
 from typing import Dict, List, Tuple
 
 from PIL import Image, ImageDraw, ImageFont
 
-from app.services.image_service.base_image_service import BaseImageService
+from app.services.image_service.base_image_service import (
+    SPECIAL_CHAR_REPLACEMENTS,
+    BaseImageService,
+    build_gradient_mask,
+    filter_unrenderable_chars,
+    load_logo,
+    render_gradient_text_image,
+)
 
 logger = logging.getLogger(__name__)
 
+# Longest line, in characters, when wrapping error details on error slides
+ERROR_LINE_MAX_CHARS = 49
+
 
 class EnhancedImageService(BaseImageService):
     """Enhanced implementation of the image service with advanced error handling.
@@ -51,25 +62,7 @@ class EnhancedImageService(BaseImageService):
 
     def _replace_special_characters(self, text: str) -> str:
         """Replace specific problematic characters with safer alternatives."""
-        replacements = {
-            "\u2192": "->",  # Right arrow
-            "\u2190": "<-",  # Left arrow
-            "\u2191": "^",  # Up arrow
-            "\u2193": "v",  # Down arrow
-            "\u2018": "'",  # Left single quote
-            "\u2019": "'",  # Right single quote
-            "\u201C": '"',  # Left double quote
-            "\u201D": '"',  # Right double quote
-            "\u2013": "-",  # En dash
-            "\u2014": "-",  # Em dash
-            "\u2026": "...",  # Ellipsis
-            # Add more problematic characters as needed
-        }
-
-        for char, replacement in replacements.items():
-            text = text.replace(char, replacement)
-
-        return text
+        return text.translate(SPECIAL_CHAR_REPLACEMENTS)
 
     def _normalize_unicode(self, text: str) -> str:
         """Normalize Unicode to canonical composition form."""
@@ -77,32 +70,7 @@ class EnhancedImageService(BaseImageService):
 
     def _handle_non_ascii_chars(self, text: str) -> str:
         """Process non-ASCII characters with careful handling."""
-        result = []
-        for char in text:
-            # Check if character is renderable or convert to a safe replacement
-            try:
-                # Encode and decode as ASCII to check if it's a simple character
-                char.encode("ascii")
-                result.append(char)
-            except UnicodeEncodeError:
-                # For non-ASCII characters, try to keep them if they're common
-                # or replace with closest ASCII approximation if possible
-                try:
-                    # Test if Pillow can render this character with default font
-                    # This is an indirect test by checking if it's a known Unicode category
-                    if (
-                        unicodedata.category(char)[0] in "LNPSZ"
-                    ):  # Letter, Number, Punctuation, Symbol, Separator
-                        result.append(char)
-                    else:
-                        # Replace with '?' for unknown/uncommon categories
-                        result.append("?")
-                except Exception as e:
-                    logger.error(f"Error with text fallback: {e}")
-                    # Fallback for any unexpected issues
-                    result.append("?")
-
-        return "".join(result)
+        return filter_unrenderable_chars(text)
 
     def create_gradient_text(
         self,
@@ -141,7 +109,7 @@ class EnhancedImageService(BaseImageService):
 
         try:
             # Get text dimensions and create gradient text
-            text_width, text_height = self._get_text_dimensions(draw, text, font)
+            text_width, text_height = self._get_text_dimensions(text, font)
 
             # Create the gradient text image
             gradient_text = self._create_gradient_text_image(
@@ -164,9 +132,9 @@ class EnhancedImageService(BaseImageService):
         empty_img = Image.new("RGBA", (1, 1), color=(0, 0, 0, 0))
         return empty_img, position
 
-    def _get_text_dimensions(self, draw: ImageDraw.Draw, text: str, font) -> Tuple[int, int]:
+    def _get_text_dimensions(self, text: str, font) -> Tuple[int, int]:
         """Get the dimensions of the text with the given font."""
-        text_bbox = draw.textbbox((0, 0), text, font=font)
+        text_bbox = font.getbbox(text)
         text_width = text_bbox[2] - text_bbox[0]
         text_height = text_bbox[3] - text_bbox[1]
 
@@ -186,38 +154,13 @@ class EnhancedImageService(BaseImageService):
         colors: List[Tuple[int, int, int]],
     ) -> Image.Image:
         """Create a gradient text image with the given colors."""
-        # Create a gradient mask
-        gradient = self._create_gradient_mask(text_width, text_height, colors)
-
-        # Create a transparent image for the text
-        text_img = Image.new("RGBA", (text_width, text_height), color=(0, 0, 0, 0))
-        text_draw = ImageDraw.Draw(text_img)
-
-        # Draw the text in white
-        text_draw.text((0, 0), text, font=font, fill="white")
-
-        # Apply the gradient mask to the text
-        text_img.putalpha(gradient)
-
-        return text_img
+        return render_gradient_text_image(text, font, text_width, text_height, colors)
 
     def _create_gradient_mask(
         self, width: int, height: int, colors: List[Tuple[int, int, int]]
     ) -> Image.Image:
         """Create a gradient mask for text from left to right."""
-        gradient = Image.new("L", (width, height), color=0)
-        gradient_draw = ImageDraw.Draw(gradient)
-
-        # Create gradient by drawing lines with increasing brightness
-        for i in range(width):
-            color_idx = i / width if width > 0 else 0
-            r = int(colors[0][0] + color_idx * (colors[1][0] - colors[0][0]))
-            g = int(colors[0][1] + color_idx * (colors[1][1] - colors[0][1]))
-            b = int(colors[0][2] + color_idx * (colors[1][2] - colors[0][2]))
-            brightness = int((r + g + b) / 3)
-            gradient_draw.line([(i, 0), (i, height)], fill=brightness)
-
-        return gradient
+        return build_gradient_mask(width, height, colors)
 
     def _calculate_centered_position(
         self, position: Tuple[int, int], text_width: int, text_height: int
@@ -384,24 +327,8 @@ class EnhancedImageService(BaseImageService):
             y_position += 30
 
     def _wrap_error_text(self, text: str) -> List[str]:
-        """Wrap error text into multiple lines based on simple character count."""
-        words = text.split()
-        lines = []
-        current_line = []
-
-        for word in words:
-            test_line = " ".join(current_line + [word])
-            # Simple character count for line length
-            if len(test_line) < 50:
-                current_line.append(word)
-            else:
-                lines.append(" ".join(current_line))
-                current_line = [word]
-
-        if current_line:
-            lines.append(" ".join(current_line))
-
-        return lines
+        """Wrap error text into lines of fewer than 50 characters."""
+        return textwrap.wrap(text, width=ERROR_LINE_MAX_CHARS)
 
     def _add_error_instruction(
         self,
@@ -470,8 +397,8 @@ class EnhancedImageService(BaseImageService):
         height = self.settings.get("height", self.default_height)
         bg_color = self.settings.get("bg_color", self.default_bg_color)
 
-        # Create the image
-        image = Image.new("RGB", (width, height), bg_color)
+        # Create the image (RGBA while compositing, flattened to RGB when done)
+        image = self._create_canvas(width, height, bg_color)
         draw = ImageDraw.Draw(image)
 
         # Load fonts with improved error handling
@@ -501,7 +428,7 @@ class EnhancedImageService(BaseImageService):
         if include_logo and logo_path:
             self._add_logo_to_slide(image, logo_path, width, height, navigation_font)
 
-        return image
+        return image.convert("RGB")
 
     def _add_title_to_slide(self, image, draw, title, title_font, width):
         """Add the title with gradient effect to the slide."""
@@ -515,19 +442,18 @@ class EnhancedImageService(BaseImageService):
                 width,
                 [(40, 100, 255), (255, 255, 255)],  # Blue to white gradient
             )
-            image.paste(gradient_text, pos, gradient_text)
+            self._composite(image, gradient_text, pos)
         except Exception as e:
             logger.error(f"Error creating gradient title: {e}")
             logger.error(traceback.format_exc())
             # Fallback to plain text title
             try:
-                text_bbox = draw.textbbox((0, 0), title, font=title_font)
-                title_width = text_bbox[2] - text_bbox[0]
                 draw.text(
-                    (width // 2 - title_width // 2, 150),
+                    (width // 2, 150),
                     title,
                     fill="white",
                     font=title_font,
+                    anchor="ma",
                 )
             except Exception as e:
                 logger.error(f"Error with text fallback: {e}")
@@ -549,27 +475,16 @@ class EnhancedImageService(BaseImageService):
             lines = ["[Text rendering error]"]
 
         # Calculate start y position to center the text block
-        line_height = 60
+        line_height = self._get_line_height(text_font)
         total_text_height = len(lines) * line_height
         y_position = height / 2 - total_text_height / 2
 
-        # Draw each line of text
+        # Draw each line of text, horizontally centered by the anchor
         for line in lines:
             try:
-                text_bbox = draw.textbbox((0, 0), line, font=text_font)
-                text_width = text_bbox[2] - text_bbox[0]
-                x_position = width / 2 - text_width / 2
-                draw.text((x_position, y_position), line, fill="white", font=text_font)
+                draw.text((width / 2, y_position), line, fill="white", font=text_font, anchor="ma")
             except Exception as e:
                 logger.error(f"Error rendering text line: {e}")
-                # Fallback using anchor
-                draw.text(
-                    (width / 2, y_position),
-                    line,
-                    fill="white",
-                    font=text_font,
-                    anchor="mt",
-                )
 
             y_position += line_height
 
@@ -611,18 +526,19 @@ class EnhancedImageService(BaseImageService):
 
         if slide_number < total_slides:
             try:
-                text_bbox = draw.textbbox((0, 0), "→", font=navigation_font)
-                text_width = text_bbox[2] - text_bbox[0]
                 draw.text(
-                    (width - 40 - text_width, height / 2),
+                    (width - 40, height / 2),
                     "→",
                     fill="white",
                     font=navigation_font,
+                    anchor="ra",
                 )
             except Exception as e:
                 logger.error(f"Error with text fallback: {e}")
                 # Fallback for right arrow
-                draw.text((width - 40, height / 2), ">", fill="white", font=navigation_font)
+                draw.text(
+                    (width - 40, height / 2), ">", fill="white", font=navigation_font, anchor="ra"
+                )
 
         # Add slide counter with error handling
         self._add_slide_counter(draw, slide_number, total_slides, navigation_font, width, height)
@@ -631,14 +547,12 @@ class EnhancedImageService(BaseImageService):
         """Add the slide counter to the slide."""
         counter_text = f"{slide_number}/{total_slides}"
         try:
-            text_bbox = draw.textbbox((0, 0), counter_text, font=navigation_font)
-            text_width = text_bbox[2] - text_bbox[0]
-            text_height = text_bbox[3] - text_bbox[1]
             draw.text(
-                (width / 2 - text_width / 2, height - 60 - text_height),
+                (width / 2, height - 60),
                 counter_text,
                 fill="white",
                 font=navigation_font,
+                anchor="mb",
             )
         except Exception as e:
             logger.error(f"Error with text fallback: {e}")
@@ -655,21 +569,15 @@ class EnhancedImageService(BaseImageService):
         """Add logo to the slide if requested."""
         try:
             if os.path.exists(logo_path):
-                logo = Image.open(logo_path).convert("RGBA")
                 # Resize logo to be 10% of the image width
                 logo_size = int(width * 0.1)
-                # Use LANCZOS if available, otherwise fallback to ANTIALIAS
-                resampling_method = Image.LANCZOS if hasattr(Image, "LANCZOS") else Image.ANTIALIAS
-                logo = logo.resize((logo_size, logo_size), resampling_method)
+                logo = load_logo(logo_path, logo_size)
 
                 # Position logo in bottom left corner with padding
                 logo_position = (30, height - logo_size - 30)
 
-                # Create a mask for the logo
-                mask = logo.split()[3] if len(logo.split()) == 4 else None
-
-                # Paste the logo onto the image
-                image.paste(logo, logo_position, mask)
+                # Blend the logo onto the image using its own alpha
+                self._composite(image, logo, logo_position)
             else:
                 logger.warning(f"Logo file not found: {logo_path}")
         except Exception as e:
@@ -10,7 +10,11 @@ from typing import List, Tuple
 
 from PIL import Image, ImageDraw, ImageFont
 
-from app.services.image_service.base_image_service import BaseImageService
+from app.services.image_service.base_image_service import (
+    BaseImageService,
+    load_logo,
+    render_gradient_text_image,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -60,32 +64,12 @@ class StandardImageService(BaseImageService):
 
         try:
             # Get text size
-            text_bbox = draw.textbbox((0, 0), text, font=font)
+            text_bbox = font.getbbox(text)
             text_width = text_bbox[2] - text_bbox[0]
             text_height = text_bbox[3] - text_bbox[1]
 
-            # Create a gradient mask
-            gradient = Image.new("L", (text_width, text_height), color=0)
-            gradient_draw = ImageDraw.Draw(gradient)
-
-            # Create gradient by drawing lines with increasing brightness
-            for i in range(text_width):
-                color_idx = i / text_width
-                r = int(colors[0][0] + color_idx * (colors[1][0] - colors[0][0]))
-                g = int(colors[0][1] + color_idx * (colors[1][1] - colors[0][1]))
-                b = int(colors[0][2] + color_idx * (colors[1][2] - colors[0][2]))
-                brightness = int((r + g + b) / 3)
-                gradient_draw.line([(i, 0), (i, text_height)], fill=brightness)
-
-            # Create a transparent image for the text
-            text_img = Image.new("RGBA", (text_width, text_height), color=(0, 0, 0, 0))
-            text_draw = ImageDraw.Draw(text_img)
-
-            # Draw the text in white
-            text_draw.text((0, 0), text, font=font, fill="white")
-
-            # Apply the gradient mask to the text
-            text_img.putalpha(gradient)
+            # Render the text in white with the gradient applied as alpha
+            text_img = render_gradient_text_image(text, font, text_width, text_height, colors)
 
             # Calculate position to center the text
             x, y = position
@@ -186,7 +170,8 @@ class StandardImageService(BaseImageService):
             PIL Image object
         """
         width, height = self.default_width, self.default_height
-        image = Image.new("RGB", (width, height), self.default_bg_color)
+        # RGBA while compositing, flattened to RGB when done
+        image = self._create_canvas(width, height, self.default_bg_color)
         draw = ImageDraw.Draw(image)
 
         # Load fonts
@@ -217,17 +202,16 @@ class StandardImageService(BaseImageService):
                     width,
                     [(0, 0, 0), (255, 255, 255)],  # Black to white gradient
                 )
-                image.paste(gradient_text, pos, gradient_text)
+                self._composite(image, gradient_text, pos)
             except Exception as e:
                 logger.error(f"Error creating gradient title: {e}")
                 # Fallback to plain text title
-                text_bbox = draw.textbbox((0, 0), sanitized_title, font=title_font)
-                title_width = text_bbox[2] - text_bbox[0]
                 draw.text(
-                    (width // 2 - title_width // 2, 150),
+                    (width // 2, 150),
                     sanitized_title,
                     fill="white",
                     font=title_font,
+                    anchor="ma",
                 )
 
         # Add main text
@@ -252,65 +236,51 @@ class StandardImageService(BaseImageService):
             lines.append(" ".join(current_line))
 
         # Calculate start y position to center the text block
-        total_text_height = len(lines) * 60  # Line height
+        line_height = self._get_line_height(text_font)
+        total_text_height = len(lines) * line_height
         y_position = height / 2 - total_text_height / 2
 
-        # Draw each line of text
+        # Draw each line of text, horizontally centered by the anchor
         for line in lines:
-            text_bbox = draw.textbbox((0, 0), line, font=text_font)
-            text_width = text_bbox[2] - text_bbox[0]
-            text_height = text_bbox[3] - text_bbox[1]
-            x_position = width / 2 - text_width / 2
-
-            draw.text((x_position, y_position), line, fill="white", font=text_font)
-            y_position += 60
+            draw.text((width / 2, y_position), line, fill="white", font=text_font, anchor="ma")
+            y_position += line_height
 
         # Add navigation arrows and slide counter
         if slide_number > 1:
             draw.text((40, height / 2), "←", fill="white", font=navigation_font)
 
         if slide_number < total_slides:
-            text_bbox = draw.textbbox((0, 0), "→", font=navigation_font)
-            text_width = text_bbox[2] - text_bbox[0]
             draw.text(
-                (width - 40 - text_width, height / 2),
+                (width - 40, height / 2),
                 "→",
                 fill="white",
                 font=navigation_font,
+                anchor="ra",
             )
 
         # Add slide counter
         counter_text = f"{slide_number}/{total_slides}"
-        text_bbox = draw.textbbox((0, 0), counter_text, font=navigation_font)
-        text_width = text_bbox[2] - text_bbox[0]
-        text_height = text_bbox[3] - text_bbox[1]
         draw.text(
-            (width / 2 - text_width / 2, height - 60 - text_height),
+            (width / 2, height - 60),
             counter_text,
             fill="white",
             font=navigation_font,
+            anchor="mb",
         )
 
         # Add logo if requested
         if include_logo and logo_path and os.path.exists(logo_path):
             try:
-                logo = Image.open(logo_path).convert("RGBA")
                 # Resize logo to be 10% of the image width
                 logo_size = int(width * 0.1)
-                logo = logo.resize(
-                    (logo_size, logo_size),
-                    Image.LANCZOS if hasattr(Image, "LANCZOS") else Image.ANTIALIAS,
-                )
+                logo = load_logo(logo_path, logo_size)
 
                 # Position logo in bottom left corner with padding
                 logo_position = (30, height - logo_size - 30)
 
-                # Create a mask for the logo
-                mask = logo.split()[3] if len(logo.split()) == 4 else None
-
-                # Paste the logo onto the image
-                image.paste(logo, logo_position, mask)
+                # Blend the logo onto the image using its own alpha
+                self._composite(image, logo, logo_position)
             except Exception as e:
                 logger.error(f"Error adding logo: {e}")
 
-        return image
+        return image.convert("RGB")
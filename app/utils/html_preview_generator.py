@@ -6,46 +6,39 @@ This script generates an HTML file for previewing Instagram carousel images.
 It can work directly with the API response or with image files.
 """
 import argparse
-import base64
+import binascii
 import json
+import re
 import sys
 from datetime import datetime
 
+# Hex characters per streamed base64 chunk; a multiple of 6 so each chunk
+# decodes to whole 3-byte base64 groups and needs no padding mid-stream
+_B64_CHUNK_HEX_CHARS = 6 * 16384
 
-def hex_to_base64(hex_string):
-    """Convert hex string to base64 for HTML embedding."""
-    try:
-        # Convert hex to binary
-        binary_data = bytes.fromhex(hex_string)
-        # Convert binary to base64
-        base64_data = base64.b64encode(binary_data).decode("utf-8")
-        return base64_data
-    except Exception as e:
-        print(f"Error converting hex to base64: {e}")
-        return None
+# Any character that is not a hex digit
+_NON_HEX_RE = re.compile(r"[^0-9a-fA-F]")
 
+# Standard-alphabet base64 with optional trailing padding
+_BASE64_RE = re.compile(r"[A-Za-z0-9+/]*={0,2}")
 
-def generate_html_preview(carousel_data, output_path=None):
-    """
-    Generate an HTML file to preview carousel images.
+# Characters that are significant in HTML text and attribute values
+_HTML_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"})
 
-    Args:
-        carousel_data: Dictionary containing carousel data (from API response)
-        output_path: Path to save the HTML file (default: carousel_preview_{timestamp}.html)
-    Returns:
-        Path to the generated HTML file
-    """
-    # Generate default output path if not provided
-    if not output_path:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = f"carousel_preview_{timestamp}.html"
-    # Generate HTML content
-    html_content = f"""<!DOCTYPE html>.
+
+def escape_html(value):
+    """Escape a value for safe interpolation into HTML in a single translate pass."""
+    return str(value).translate(_HTML_ESCAPES)
+
+
+# Static document head (styles and page header); only the header fields are
+# substituted per call, so the CSS braces are escaped once here
+_HEAD_TEMPLATE = """<!DOCTYPE html>.
 <html>
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Instagram Carousel Preview - {carousel_data.get('carousel_id', 'Unknown')}</title>
+    <title>Instagram Carousel Preview - {carousel_id}</title>
     <style>
         body {{
             font-family: Arial, sans-serif;
@@ -179,79 +172,30 @@ def generate_html_preview(carousel_data, output_path=None):
     <header>
         <h1>Instagram Carousel Preview</h1>
         <div class="info">
-            <span>Carousel ID: {carousel_data.get('carousel_id', 'Unknown')}</span>
-            <span>Status: {carousel_data.get('status', 'Unknown')}</span>
-            <span>Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</span>
+            <span>Carousel ID: {carousel_id}</span>
+            <span>Status: {status}</span>
+            <span>Generated: {generated}</span>
         </div>
     </header>
     <div class="carousel-container">
 """
-    # Add warnings if any
-    if carousel_data.get("warnings"):
-        html_content += '        <div class="warning">\n'
-        html_content += "            <strong>Warnings:</strong>\n"
-        html_content += "            <ul>\n"
-        for warning in carousel_data["warnings"]:
-            html_content += f"                <li>{warning}</li>\n"
-        html_content += "            </ul>\n"
-        html_content += "        </div>\n"
-
-    # Add carousel
-    html_content += '        <div class="carousel" id="carousel">\n'
-
-    # Add slides
-    for i, slide in enumerate(carousel_data.get("slides", [])):
-        slide_num = i + 1
-        filename = slide.get("filename", f"slide_{slide_num}.png")
-        content = slide.get("content", "")
-        is_error = "error" in filename.lower()
-
-        # Convert hex to base64
-        base64_data = hex_to_base64(content) if content else ""
-
-        html_content += (
-            f'            <div class="slide{" error-slide" if is_error else ""}" '
-            f'id="slide{slide_num}">\n'
-        )
-        html_content += '                <div class="slide-header">\n'
-        html_content += (
-            f'                    <div class="slide-num">Slide {slide_num} of '
-            f'{len(carousel_data.get("slides", []))}</div>\n'
-        )
-        html_content += '                    <div class="slide-filename">{filename}</div>\n'
-        html_content += "                </div>\n"
-        html_content += '                <div class="slide-image">\n'
-
-        if base64_data:
-            html_content += (
-                f'                    <img src="data:image/png;base64,{base64_data}" '
-                f'alt="Slide {slide_num}">\n'
-            )
-        else:
-            html_content += "                    <p>Image data not available</p>\n"
 
-        html_content += "                </div>\n"
-        html_content += "            </div>\n"
-
-    html_content += "        </div>\n"
-
-    # Add slide controls
-    html_content += '        <div class="slide-controls">\n'
-    html_content += '            <button id="prevBtn">Previous</button>\n'
-    html_content += '            <button id="nextBtn">Next</button>\n'
-    html_content += "        </div>\n"
-
-    # Add slide indicators
-    html_content += '        <div class="slide-indicator" id="indicator">\n'
-    for i in range(len(carousel_data.get("slides", []))):
-        html_content += f'            <span class="dot" data-slide="{i + 1}"></span>\n'
-    html_content += "        </div>\n"
-
-    # Close container
-    html_content += "    </div>\n"
+# Markup of a slide up to its image, and after it
+_SLIDE_OPEN_TEMPLATE = """\
+            <div class="slide{error_class}" id="slide{num}">
+                <div class="slide-header">
+                    <div class="slide-num">Slide {num} of {total}</div>
+                    <div class="slide-filename">{filename}</div>
+                </div>
+                <div class="slide-image">
+"""
+_SLIDE_CLOSE_HTML = """\
+                </div>
+            </div>
+"""
 
-    # Add JavaScript
-    html_content += """
+# Static navigation script and closing tags, written verbatim
+_TAIL_HTML = """
     <script>
         document.addEventListener('DOMContentLoaded', function() {
             const carousel = document.getElementById('carousel');
@@ -322,9 +266,148 @@ def generate_html_preview(carousel_data, output_path=None):
 </body>
 </html>
 """
-    # Write HTML file
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html_content)
+
+
+def is_hex(content):
+    """
+    Check that content is an even-length string of hex digits.
+
+    A single search for a non-hex character is far cheaper than matching the
+    whole string against a pattern of digit pairs.
+
+    Args:
+        content: String to check
+    Returns:
+        True if content can be decoded with binascii.unhexlify
+    """
+    return len(content) % 2 == 0 and not _NON_HEX_RE.search(content)
+
+
+def is_base64(content):
+    """
+    Check that content is padded, standard-alphabet base64.
+
+    The minimal API returns slides as base64, which can go into a data URI as is.
+
+    Args:
+        content: String to check
+    Returns:
+        True if content can be decoded with binascii.a2b_base64
+    """
+    return len(content) % 4 == 0 and _BASE64_RE.fullmatch(content) is not None
+
+
+def write_hex_as_base64(f, hex_string):
+    """
+    Stream hex-encoded content to a file as base64, one chunk at a time.
+
+    Only one chunk of decoded bytes is held in memory instead of the whole image.
+
+    Args:
+        f: Text file object to write to
+        hex_string: Hex-encoded content, already validated with is_hex
+    """
+    for start in range(0, len(hex_string), _B64_CHUNK_HEX_CHARS):
+        chunk = binascii.unhexlify(hex_string[start : start + _B64_CHUNK_HEX_CHARS])
+        f.write(binascii.b2a_base64(chunk, newline=False).decode("ascii"))
+
+
+def generate_html_preview(carousel_data, output_path=None):
+    """
+    Generate an HTML file to preview carousel images.
+
+    Args:
+        carousel_data: Dictionary containing carousel data (from API response)
+        output_path: Path to save the HTML file (default: carousel_preview_{timestamp}.html)
+    Returns:
+        Path to the generated HTML file
+    """
+    # Generate default output path if not provided
+    if not output_path:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = f"carousel_preview_{timestamp}.html"
+    carousel_id = escape_html(carousel_data.get("carousel_id", "Unknown"))
+    status = escape_html(carousel_data.get("status", "Unknown"))
+    # Stream the document to disk so only one slide's data is held at a time
+    with open(output_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        # Only the header fields are substituted into the static head
+        f.write(
+            _HEAD_TEMPLATE.format(
+                carousel_id=carousel_id,
+                status=status,
+                generated=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            )
+        )
+
+        # Add warnings if any
+        if carousel_data.get("warnings"):
+            f.write('        <div class="warning">\n')
+            f.write("            <strong>Warnings:</strong>\n")
+            f.write("            <ul>\n")
+            for warning in carousel_data["warnings"]:
+                f.write(f"                <li>{escape_html(warning)}</li>\n")
+            f.write("            </ul>\n")
+            f.write("        </div>\n")
+
+        # Add carousel
+        f.write('        <div class="carousel" id="carousel">\n')
+
+        # Add slides, one write for the markup before and after each image
+        slides = carousel_data.get("slides", [])
+        for slide_num, slide in enumerate(slides, start=1):
+            filename = slide.get("filename", f"slide_{slide_num}.png")
+            content = slide.get("content", "")
+
+            f.write(
+                _SLIDE_OPEN_TEMPLATE.format(
+                    error_class=" error-slide" if "error" in filename.lower() else "",
+                    num=slide_num,
+                    total=len(slides),
+                    filename=escape_html(filename),
+                )
+            )
+
+            # Validate before streaming so bad content never leaves half an <img> tag.
+            # Hex is tried first: an all-digit string is valid in both encodings
+            if content and is_hex(content):
+                f.write('                    <img src="data:image/png;base64,')
+                write_hex_as_base64(f, content)
+                f.write(f'" alt="Slide {slide_num}">\n')
+            elif content and is_base64(content):
+                f.write(
+                    f'                    <img src="data:image/png;base64,{content}" '
+                    f'alt="Slide {slide_num}">\n'
+                )
+            else:
+                if content:
+                    print("Error embedding image: content is neither hex nor base64")
+                f.write("                    <p>Image data not available</p>\n")
+
+            f.write(_SLIDE_CLOSE_HTML)
+
+        f.write("        </div>\n")
+
+        # Add slide controls
+        f.write('        <div class="slide-controls">\n')
+        f.write('            <button id="prevBtn">Previous</button>\n')
+        f.write('            <button id="nextBtn">Next</button>\n')
+        f.write("        </div>\n")
+
+        # Add slide indicators
+        f.write('        <div class="slide-indicator" id="indicator">\n')
+        f.write(
+            "".join(
+                f'            <span class="dot" data-slide="{n}"></span>\n'
+                for n in range(1, len(slides) + 1)
+            )
+        )
+        f.write("        </div>\n")
+
+        # Close container
+        f.write("    </div>\n")
+
+        # Add JavaScript
+        f.write(_TAIL_HTML)
 
     print(f"HTML preview generated: {output_path}")
     return output_path
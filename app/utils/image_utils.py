@@ -5,11 +5,19 @@ This module provides helper functions for image processing, such as
 text sanitization, gradient text creation, and font loading.
 """
 import logging
+import textwrap
 import traceback
 import unicodedata
 from typing import List, Optional, Tuple
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+
+from app.services.image_service.base_image_service import (
+    SPECIAL_CHAR_REPLACEMENTS,
+    build_gradient_mask,
+    filter_unrenderable_chars,
+    load_font,
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -33,55 +41,13 @@ def enhanced_sanitize_text(text) -> str:
         text = str(text)
 
     # Replace specific problematic characters that might cause rendering issues
-    replacements = {
-        "\u2192": "->",  # Right arrow
-        "\u2190": "<-",  # Left arrow
-        "\u2191": "^",  # Up arrow
-        "\u2193": "v",  # Down arrow
-        "\u2018": "'",  # Left single quote
-        "\u2019": "'",  # Right single quote
-        "\u201C": '"',  # Left double quote
-        "\u201D": '"',  # Right double quote
-        "\u2013": "-",  # En dash
-        "\u2014": "-",  # Em dash
-        "\u2026": "...",  # Ellipsis
-        # Add more problematic characters as needed
-    }
-
-    for char, replacement in replacements.items():
-        text = text.replace(char, replacement)
+    text = text.translate(SPECIAL_CHAR_REPLACEMENTS)
 
     # First, try NFC normalization (canonical composition)
     text = unicodedata.normalize("NFC", text)
 
-    # Then do a safer approach that attempts to preserve as much as possible
-    # while removing characters that can't be rendered
-    result = []
-    for char in text:
-        # Check if character is renderable or convert to a safe replacement
-        try:
-            # Encode and decode as ASCII to check if it's a simple character
-            char.encode("ascii")
-            result.append(char)
-        except UnicodeEncodeError:
-            # For non-ASCII characters, try to keep them if they're common
-            # or replace with closest ASCII approximation if possible
-            try:
-                # Test if Pillow can render this character with default font
-                # This is an indirect test by checking if it's a known Unicode category
-                if (
-                    unicodedata.category(char)[0] in "LNPSZ"
-                ):  # Letter, Number, Punctuation, Symbol, Separator
-                    result.append(char)
-                else:
-                    # Replace with '?' for unknown/uncommon categories
-                    result.append("?")
-            except Exception as e:
-                logger.error(f"Error with text fallback: {e}")
-                # Fallback for any unexpected issues
-                result.append("?")
-
-    return "".join(result)
+    # Keep non-ASCII characters from renderable categories and replace the rest
+    return filter_unrenderable_chars(text)
 
 
 def safe_load_font(
@@ -98,31 +64,25 @@ def safe_load_font(
     Returns:
         PIL ImageFont object
     """
-    try:
-        return ImageFont.truetype(font_path, size)
-    except (IOError, OSError) as e:
-        logger.warning(f"Could not load font {font_path} at size {size}: {e}")
-        try:
-            # Try loading a common system font
-            for system_font in [
-                "Arial.ttf",
-                "DejaVuSans.ttf",
-                "FreeSans.ttf",
-                "LiberationSans-Regular.ttf",
-            ]:
-                try:
-                    return ImageFont.truetype(
-                        system_font, size if fallback_size is None else fallback_size
-                    )
-                except Exception as e:
-                    logger.error(f"Error with text fallback: {e}")
-                    continue
-
-            # If all else fails, use default
-            return ImageFont.load_default()
-        except Exception as e:
-            logger.error(f"Failed to load any substitute font: {e}")
-            return ImageFont.load_default()
+    # Shares the image services' font cache, fallbacks included
+    return load_font(font_path, size, fallback_size)
+
+
+def create_gradient_mask(
+    width: int, height: int, colors: List[Tuple[int, int, int]]
+) -> Image.Image:
+    """
+    Create an "L" mask whose brightness ramps from the first color to the second.
+
+    Args:
+        width: Width of the mask
+        height: Height of the mask
+        colors: List of (r, g, b) tuples for gradient start and end
+
+    Returns:
+        PIL Image in "L" mode
+    """
+    return build_gradient_mask(width, height, colors)
 
 
 def create_gradient_text(
@@ -161,7 +121,7 @@ def create_gradient_text(
 
     try:
         # Get text size
-        text_bbox = draw.textbbox((0, 0), text, font=font)
+        text_bbox = font.getbbox(text)
         text_width = text_bbox[2] - text_bbox[0]
         text_height = text_bbox[3] - text_bbox[1]
 
@@ -171,27 +131,17 @@ def create_gradient_text(
             text_height = max(text_height, 10)
 
         # Create a gradient mask
-        gradient = Image.new("L", (text_width, text_height), color=0)
-        gradient_draw = ImageDraw.Draw(gradient)
-
-        # Create gradient by drawing lines with increasing brightness
-        for i in range(text_width):
-            color_idx = i / text_width if text_width > 0 else 0
-            r = int(colors[0][0] + color_idx * (colors[1][0] - colors[0][0]))
-            g = int(colors[0][1] + color_idx * (colors[1][1] - colors[0][1]))
-            b = int(colors[0][2] + color_idx * (colors[1][2] - colors[0][2]))
-            brightness = int((r + g + b) / 3)
-            gradient_draw.line([(i, 0), (i, text_height)], fill=brightness)
-
-        # Create a transparent image for the text
-        text_img = Image.new("RGBA", (text_width, text_height), color=(0, 0, 0, 0))
-        text_draw = ImageDraw.Draw(text_img)
+        gradient = create_gradient_mask(text_width, text_height, colors)
 
-        # Draw the text in white
-        text_draw.text((0, 0), text, font=font, fill="white")
+        # Draw the text's coverage into a single-channel image
+        coverage = Image.new("L", (text_width, text_height), color=0)
+        ImageDraw.Draw(coverage).text((0, 0), text, font=font, fill=255)
 
-        # Apply the gradient mask to the text
-        text_img.putalpha(gradient)
+        # Create a white, transparent image and scale the glyph coverage by the
+        # gradient in one C pass; replacing the alpha outright would turn the
+        # whole box into an opaque gradient
+        text_img = Image.new("RGBA", (text_width, text_height), color=(255, 255, 255, 0))
+        text_img.putalpha(ImageChops.multiply(coverage, gradient))
 
         # Calculate position to center the text
         x, y = position
@@ -286,22 +236,8 @@ def create_enhanced_error_slide(
 
     text_position = (width // 2, height // 2)
 
-    # Split long error message into multiple lines
-    words = error_detail.split()
-    lines = []
-    current_line = []
-
-    for word in words:
-        test_line = " ".join(current_line + [word])
-        # Check if adding this word exceeds the width
-        if len(test_line) < 50:  # Simple character count for line length
-            current_line.append(word)
-        else:
-            lines.append(" ".join(current_line))
-            current_line = [word]
-
-    if current_line:
-        lines.append(" ".join(current_line))
+    # Split long error message into lines of fewer than 50 characters
+    lines = textwrap.wrap(error_detail, width=49)
 
     # Draw each line of text
     y_position = height // 2 + 20
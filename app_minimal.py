@@ -2,25 +2,31 @@
 Minimal implementation of the Instagram Carousel Generator API.
 
 This module provides a simplified version of the Instagram Carousel Generator,
-containing all core functionality in a single file for easier understanding and deployment.
-It includes image generation utilities, API endpoints, and data models.
+containing its core functionality in a single file for easier understanding and deployment.
+It includes slide rendering, API endpoints, and data models, and shares the gradient text
+helper with the full application.
 """
-import os
-import tempfile
-import uuid
+import binascii
+import io
+import secrets
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Optional
 
 import uvicorn
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from PIL import Image, ImageDraw, ImageFont
 from pydantic import BaseModel, Field
 
+from app.utils.image_utils import create_gradient_text
+
 app = FastAPI(
     title="Instagram Carousel Generator API - Minimal",
     description="API for generating Instagram carousel images with consistent styling",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -60,7 +66,7 @@ class SlideResponse(BaseModel):
     """Response model for a generated slide."""
 
     filename: str = Field(..., description="Filename of the generated image")
-    content: str = Field(..., description="Hex-encoded image content")
+    content: str = Field(..., description="Base64-encoded image content")
 
 
 class CarouselResponse(BaseModel):
@@ -71,60 +77,22 @@ class CarouselResponse(BaseModel):
     slides: List[SlideResponse] = Field(..., description="Generated slide images")
 
 
-# Define image utilities directly in this file
-def create_gradient_text(draw, text, position, font, width, colors=None):
-    """Create gradient text from one color to another."""
-    if colors is None:
-        # Default black to white gradient
-        colors = [(0, 0, 0), (255, 255, 255)]
-
-    # Get text size
-    text_bbox = draw.textbbox((0, 0), text, font=font)
-    text_width = text_bbox[2] - text_bbox[0]
-    text_height = text_bbox[3] - text_bbox[1]
-
-    # Create a gradient mask
-    gradient = Image.new("L", (text_width, text_height), color=0)
-    gradient_draw = ImageDraw.Draw(gradient)
-
-    # Create gradient by drawing lines with increasing brightness
-    for i in range(text_width):
-        color_idx = i / text_width
-        r = int(colors[0][0] + color_idx * (colors[1][0] - colors[0][0]))
-        g = int(colors[0][1] + color_idx * (colors[1][1] - colors[0][1]))
-        b = int(colors[0][2] + color_idx * (colors[1][2] - colors[0][2]))
-        brightness = int((r + g + b) / 3)
-        gradient_draw.line([(i, 0), (i, text_height)], fill=brightness)
-
-    # Create a transparent image for the text
-    text_img = Image.new("RGBA", (text_width, text_height), color=(0, 0, 0, 0))
-    text_draw = ImageDraw.Draw(text_img)
-
-    # Draw the text in white
-    text_draw.text((0, 0), text, font=font, fill="white")
-
-    # Apply the gradient mask to the text
-    text_img.putalpha(gradient)
+# Load the default font once; font objects are read-only and safe to share
+_DEFAULT_FONT = ImageFont.load_default()
 
-    # Calculate position to center the text
-    x, y = position
-    x = x - text_width // 2
-    y = y - text_height // 2
-
-    return text_img, (x, y)
+# Blank 1080x1080 slide with the dark background, copied for every slide
+_BACKGROUND = Image.new("RGB", (1080, 1080), (18, 18, 18))
 
 
 def create_slide_image(title, text, slide_number, total_slides, include_logo=False, logo_path=None):
     """Create an Instagram carousel slide with the specified styling."""
-    width, height = 1080, 1080  # Default image size
-    bg_color = (18, 18, 18)  # Dark background
-    image = Image.new("RGB", (width, height), bg_color)
+    width, height = _BACKGROUND.size
+    # Copying the filled template is a memcpy, cheaper than filling a new image
+    image = _BACKGROUND.copy()
     draw = ImageDraw.Draw(image)
 
-    # Load fonts (using default for simplicity in this minimal version)
-    title_font = ImageFont.load_default()
-    text_font = ImageFont.load_default()
-    navigation_font = ImageFont.load_default()
+    # Fonts (the shared default for simplicity in this minimal version)
+    title_font = text_font = navigation_font = _DEFAULT_FONT
 
     # Add title with gradient effect (only on first slide)
     if title:
@@ -166,43 +134,40 @@ def create_carousel_images(
     carousel_title, slides_data, carousel_id, include_logo=False, logo_path=None
 ):
     """Create carousel images for Instagram based on text content."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        image_files = []
-
-        # Generate each slide
-        for index, slide in enumerate(slides_data):
-            slide_text = slide.text
-            slide_number = index + 1
-            total_slides = len(slides_data)
-
-            # Create image
-            img = create_slide_image(
-                carousel_title if index == 0 else None,
-                # Only show title on first slide
-                slide_text,
-                slide_number,
-                total_slides,
-                include_logo,
-                logo_path,
-            )
-
-            # Save image
-            filename = os.path.join(temp_dir, f"slide_{slide_number}.png")
-            img.save(filename)
-
-            # Read file and convert to hex
-            with open(filename, "rb") as f:
-                file_content = f.read()
-
-            # Add to result
-            image_files.append(
-                {
-                    "filename": f"slide_{slide_number}.png",
-                    "content": file_content.hex(),  # Convert binary to hex for JSON
-                }
-            )
-
-        return image_files
+    total_slides = len(slides_data)
+
+    def render_slide(index):
+        slide_number = index + 1
+
+        # Create image
+        img = create_slide_image(
+            carousel_title if index == 0 else None,
+            # Only show title on first slide
+            slides_data[index].text,
+            slide_number,
+            total_slides,
+            include_logo,
+            logo_path,
+        )
+
+        # Encode the PNG in memory instead of writing and re-reading a temp file
+        buffer = io.BytesIO()
+        img.save(buffer, format="PNG")
+        file_content = buffer.getvalue()
+
+        return {
+            "filename": f"slide_{slide_number}.png",
+            # Base64 grows the payload by a third where hex doubles it
+            "content": binascii.b2a_base64(file_content, newline=False).decode("ascii"),
+        }
+
+    if not total_slides:
+        return []
+
+    # Slides are independent and Pillow releases the GIL while drawing and
+    # encoding, so render them on a thread pool; map keeps slide order
+    with ThreadPoolExecutor(max_workers=min(8, total_slides)) as executor:
+        return list(executor.map(render_slide, range(total_slides)))
 
 
 @app.post("/api/generate-carousel", response_model=CarouselResponse)
@@ -210,7 +175,7 @@ async def generate_carousel(request: CarouselRequest):
     """Generate carousel images from provided text content."""
     try:
         # Create a unique ID for this carousel
-        carousel_id = str(uuid.uuid4())[:8]
+        carousel_id = secrets.token_hex(4)
 
         # Generate carousel images
         result = create_carousel_images(
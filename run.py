@@ -14,5 +14,8 @@ if __name__ == "__main__":
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
+        # Reloading needs a single process; otherwise run separate worker
+        # processes so concurrent carousels are not serialized by the GIL
+        workers=1 if settings.DEBUG else settings.WORKERS,
         factory=True,
     )
@@ -16,8 +16,8 @@ import sys
 # Add the parent directory to path so we can import the app modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-# Import the storage service module
-from app.services import storage_service  # noqa: E402
+# Import the shared storage service instance
+from app.services.storage_service import storage_service  # noqa: E402
 
 # Configure logging
 logging.basicConfig(
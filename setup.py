@@ -36,10 +36,14 @@ setup(
         "python-dotenv>=1.0.0",
         "pydantic>=2.5.2",
         "pydantic-settings>=2.1.0",
+        "orjson>=3.9.0",
     ],
     extras_require={
         "dev": [
             "pytest>=8.2.0",
+            "pytest-xdist>=3.5.0",
+            "pytest-profiling>=1.7.0",
+            "pytest-memray>=1.11.0; sys_platform != 'win32'",
             "httpx>=0.24.1",
             "black>=24.3.0",  # Updated to fix CVE-2024-21503
             "flake8>=6.0.0",
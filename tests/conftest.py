@@ -4,12 +4,12 @@ Pytest configuration file providing common fixtures for tests.
 This module defines fixtures that can be used across all test files,
 promoting test modularity and reducing code duplication.
 """
+import copy
+import functools
 import logging
-import os
-import tempfile
-import time
 from pathlib import Path
-from typing import Any, Dict, Generator
+from types import SimpleNamespace
+from typing import Any, Dict
 from unittest.mock import MagicMock
 
 import pytest
@@ -32,13 +32,16 @@ from app.services.storage_service import StorageService
 
 
 # Import create_app directly to avoid circular dependencies
+@functools.lru_cache(maxsize=1)
 def get_app():
     """
     Get the FastAPI application instance.
 
     This function is a convenience wrapper that imports and returns the
     application instance created by app.main.create_app(). It helps avoid
-    circular imports when the application needs to be referenced.
+    circular imports when the application needs to be referenced. The app
+    is built once and shared, since building it registers every router and
+    middleware.
 
     Returns:
         FastAPI: The configured FastAPI application instance
@@ -49,7 +52,9 @@ def get_app():
 
 
 # Application fixtures
-@pytest.fixture
+# The app, client and image services are read-only in tests, so they are built
+# once per session rather than for every test function
+@pytest.fixture(scope="session")
 def app() -> FastAPI:
     """
     Create a test app instance.
@@ -60,7 +65,7 @@ def app() -> FastAPI:
     return get_app()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client(app: FastAPI) -> TestClient:
     """
     Create a test client for the app.
@@ -71,55 +76,66 @@ def client(app: FastAPI) -> TestClient:
     Returns:
         TestClient: A FastAPI test client
     """
+    # Created without entering the client's context, so the app's lifespan
+    # (which cleans up the real temp directory) does not run in tests
     return TestClient(app)
 
 
 # Directory and file fixtures
-@pytest.fixture
-def temp_dir() -> Generator[str, None, None]:
+@pytest.fixture(scope="session")
+def temp_dir(tmp_path_factory: pytest.TempPathFactory) -> str:
     """
-    Create a temporary directory for tests.
+    Create a temporary directory shared by the tests in a session.
 
-    Yields:
+    pytest creates it under its own base temp directory and prunes old runs,
+    so there is no per-test mkdir and rmtree.
+
+    Args:
+        tmp_path_factory: pytest's session temporary path factory
+
+    Returns:
         str: Path to the temporary directory
     """
-    with tempfile.TemporaryDirectory() as temp_dir:
-        yield temp_dir
+    return str(tmp_path_factory.mktemp("carousel_tests"))
 
 
 @pytest.fixture
-def temp_file() -> Generator[str, None, None]:
+def temp_file(tmp_path: Path) -> str:
     """
     Create a temporary file for tests.
 
-    Yields:
+    Args:
+        tmp_path: pytest's per-test temporary directory
+
+    Returns:
         str: Path to the temporary file
     """
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-        yield temp_file.name
-    # Clean up after test
-    if os.path.exists(temp_file.name):
-        os.unlink(temp_file.name)
+    path = tmp_path / "tmp.bin"
+    path.touch()
+    return str(path)
 
 
 # Service fixtures
 @pytest.fixture
-def storage_service(temp_dir: str) -> StorageService:
+def storage_service(tmp_path: Path) -> StorageService:
     """
     Create a storage service instance for tests.
 
+    The service writes carousels, so it gets its own directory rather than
+    the session-wide temp_dir.
+
     Args:
-        temp_dir: Path to a temporary directory
+        tmp_path: pytest's per-test temporary directory
 
     Returns:
         StorageService: A configured storage service
     """
     service = StorageService()
-    service.temp_dir = Path(temp_dir)
+    service.temp_dir = tmp_path
     return service
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def standard_image_service() -> BaseImageService:
     """
     Fixture to provide a standard image service for tests.
@@ -138,7 +154,7 @@ def standard_image_service() -> BaseImageService:
     return get_image_service(ImageServiceType.STANDARD.value, settings)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def enhanced_image_service() -> BaseImageService:
     """
     Fixture to provide an enhanced image service for tests.
@@ -158,6 +174,15 @@ def enhanced_image_service() -> BaseImageService:
 
 
 # Mock fixtures
+# Fixed request start time returned by the mocked log_request_info dependency
+FROZEN_START_TIME = 1_700_000_000.0
+
+
+def _sanitize_passthrough(text: Any) -> str:
+    """Stand in for sanitize_text on mocks: stringify the input, mapping None to ''."""
+    return str(text) if text is not None else ""
+
+
 @pytest.fixture
 def mock_image_service() -> MagicMock:
     """
@@ -176,7 +201,7 @@ def mock_image_service() -> MagicMock:
     # Add additional common mock methods
     mock_service.create_slide_image.return_value = MagicMock()  # Returns a mock PIL Image
     mock_service.create_error_slide.return_value = MagicMock()  # Returns a mock PIL Image
-    mock_service.sanitize_text.side_effect = lambda x: str(x) if x is not None else ""
+    mock_service.sanitize_text.side_effect = _sanitize_passthrough
 
     return mock_service
 
@@ -199,17 +224,15 @@ def mock_storage_service(temp_dir: str) -> MagicMock:
         "http://test-url.com/temp/test123/slide_1.png"
     ]
 
-    # Mock temp directory methods
+    # Mock temp directory methods; temp_dir already exists for the whole session
     temp_path = Path(temp_dir)
-    os.makedirs(temp_path, exist_ok=True)
     mock_service.temp_dir = temp_path
 
-    # Mock the get_file_path method to return a Path object that can be patched
-    mock_path = MagicMock(spec=Path)
-    mock_service.get_file_path.return_value = mock_path
-    mock_path.exists.return_value = True
-    mock_path.is_file.return_value = True
-    mock_path.__str__.return_value = str(temp_path / "test123" / "slide_1.png")
+    # Point get_file_path at a real file; tests simulate a missing file by deleting it
+    slide_path = temp_path / "test123" / "slide_1.png"
+    slide_path.parent.mkdir(parents=True, exist_ok=True)
+    slide_path.write_bytes(b"\x89PNG\r\n\x1a\n")
+    mock_service.get_file_path.return_value = slide_path
 
     # Additional commonly used methods
     mock_service.get_content_type.return_value = "image/png"
@@ -219,30 +242,31 @@ def mock_storage_service(temp_dir: str) -> MagicMock:
 
 
 @pytest.fixture
-def test_request() -> MagicMock:
+def test_request() -> SimpleNamespace:
     """
-    Create a mock request object for testing.
+    Create a stand-in request object for testing.
+
+    Only the attributes the dependencies read are provided, as plain namespaces.
 
     Returns:
-        MagicMock: A mock FastAPI Request object
+        SimpleNamespace: A stand-in for a FastAPI Request object
     """
-    mock_req = MagicMock(spec=Request)
-    mock_req.client = MagicMock()
-    mock_req.client.host = "127.0.0.1"
-    mock_req.method = "POST"
-    mock_req.url = MagicMock()
-    mock_req.url.path = "/api/v1/test"
-    mock_req.state = MagicMock()
-
-    return mock_req
+    return SimpleNamespace(
+        client=SimpleNamespace(host="127.0.0.1"),
+        method="POST",
+        url=SimpleNamespace(path="/api/v1/test"),
+        state=SimpleNamespace(),
+    )
 
 
 @pytest.fixture
 def client_with_mocks(
     app: FastAPI,
+    client: TestClient,
     mock_image_service: MagicMock,
     mock_storage_service: MagicMock,
-    test_request: MagicMock,
+    test_request: SimpleNamespace,
+    monkeypatch: pytest.MonkeyPatch,
 ) -> TestClient:
     """
     Create a test client with mocked dependencies.
@@ -252,33 +276,36 @@ def client_with_mocks(
 
     Args:
         app: The FastAPI application
+        client: The session's test client for the app
         mock_image_service: A mock image service
         mock_storage_service: A mock storage service
-        test_request: A mock request object
+        test_request: A stand-in request object
+        monkeypatch: pytest's monkeypatch fixture, used to revert the overrides
 
     Returns:
         TestClient: A FastAPI test client with dependency overrides
     """
     # Set up dependency overrides
-    app.dependency_overrides = {
+    overrides = {
         get_enhanced_image_service: lambda: mock_image_service,
         get_storage_service: lambda: mock_storage_service,
         get_api_key: lambda: True,
         # Create async mocks for async dependencies
         # Mock the request logging dependency
-        log_request_info: lambda *args, **kwargs: time.time(),
+        log_request_info: lambda *args, **kwargs: FROZEN_START_TIME,
         # Mock the Request dependency to fix routing issues
         Request: lambda *args, **kwargs: test_request,
         set_v1_api_version: lambda *args, **kwargs: None,  # Mock API versioning function
     }
 
-    # Create a test client
-    client = TestClient(app)
-
-    yield client
+    # Install the overrides on the shared app through monkeypatch, so exactly
+    # these keys are reverted after the test even if it fails
+    for dependency, override in overrides.items():
+        monkeypatch.setitem(app.dependency_overrides, dependency, override)
 
-    # Clean up
-    app.dependency_overrides = {}
+    # The overrides live on the app, so the session's client picks them up
+    # without building another client
+    return client
 
 
 # Test data fixtures
@@ -318,45 +345,51 @@ def test_image() -> Dict[str, Any]:
     }
 
 
+# Request payload matching the CarouselRequest model
+CAROUSEL_REQUEST_DATA: Dict[str, Any] = {
+    "carousel_title": "Test Carousel",
+    "slides": [{"text": "This is slide 1"}, {"text": "This is slide 2"}],
+    "include_logo": False,
+    "logo_path": None,
+    "settings": None,
+}
+
+
 @pytest.fixture
 def carousel_request_data() -> Dict[str, Any]:
     """
     Create test carousel request data that matches the CarouselRequest model.
 
+    Each test gets its own copy, so tests may edit it freely.
+
     Returns:
         Dict[str, Any]: A dictionary of carousel request data
     """
-    return {
-        "carousel_title": "Test Carousel",
-        "slides": [{"text": "This is slide 1"}, {"text": "This is slide 2"}],
-        "include_logo": False,
-        "logo_path": None,
-        "settings": None,
-    }
+    return copy.deepcopy(CAROUSEL_REQUEST_DATA)
 
 
-@pytest.fixture
-def carousel_request(carousel_request_data: Dict[str, Any]) -> CarouselRequest:
+@pytest.fixture(scope="session")
+def carousel_request() -> CarouselRequest:
     """
     Create a CarouselRequest model instance for testing.
 
-    Args:
-        carousel_request_data: Dictionary of carousel request data
+    The model is validated once per session; tests that need to change it
+    should work on carousel_request.model_copy(deep=True).
 
     Returns:
         CarouselRequest: A CarouselRequest model instance
     """
-    return CarouselRequest(**carousel_request_data)
+    return CarouselRequest.model_validate(CAROUSEL_REQUEST_DATA)
 
 
 # Configure logging for tests
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="session", autouse=True)
 def configure_test_logging():
     """
     Configure logging for tests.
 
-    This fixture is automatically used in all tests to configure
-    logging appropriately for the test environment.
+    This fixture runs once per session to configure logging
+    appropriately for the test environment.
     """
     # Set up logging to console with a reasonable level
     logging.basicConfig(
@@ -9,7 +9,8 @@ import re
 import pytest
 from fastapi import status
 
-# Import the get_app function to avoid circular imports
+# Carousel IDs are 8 lowercase hex characters (secrets.token_hex(4))
+_CAROUSEL_ID_RE = re.compile(r"^[0-9a-f]{8}$")
 
 
 class TestHealthAndInfo:
@@ -57,7 +58,7 @@ class TestCarouselGeneration:
         assert data["status"] == "success"
         assert "carousel_id" in data
         assert isinstance(data["carousel_id"], str)
-        assert re.match(r"^[0-9a-f]{8}$", data["carousel_id"]) is not None
+        assert _CAROUSEL_ID_RE.match(data["carousel_id"]) is not None
         assert "slides" in data
         assert len(data["slides"]) > 0
         assert "processing_time" in data
@@ -105,17 +106,18 @@ class TestCarouselGeneration:
 class TestFileAccess:
     """Tests for file access endpoints."""
 
-    @pytest.mark.skip(reason="Complex async mocking - needs separate integration test")
     def test_get_temp_file(self, client_with_mocks, mock_storage_service):
         """Test accessing a temporary file."""
-        # This test is skipped because it requires complex async mocking
-        # that's better handled in a dedicated integration test
+        response = client_with_mocks.get("/api/v1/temp/test123/slide_1.png")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "image/png"
+        assert response.content == mock_storage_service.get_file_path.return_value.read_bytes()
 
     def test_get_nonexistent_temp_file(self, client_with_mocks, mock_storage_service):
         """Test accessing a non-existent temporary file."""
-        # Update the mock to simulate a file not found
-        mock_path = mock_storage_service.get_file_path.return_value
-        mock_path.exists.return_value = False
+        # Remove the file the mock points at to simulate a file not found
+        mock_storage_service.get_file_path.return_value.unlink()
 
         response = client_with_mocks.get("/api/v1/temp/test123/nonexistent.png")
 
@@ -4,200 +4,94 @@ Tests for dependency injection in the Instagram Carousel Generator.
 This module demonstrates how to test API endpoints with mocked dependencies,
 showing the benefits of proper dependency injection for testability.
 """
-import os
-import tempfile
-from pathlib import Path
-from unittest.mock import MagicMock
+import json
 
 import pytest
 from fastapi import Request
 from fastapi.testclient import TestClient
 
-from app import get_app
 from app.api.dependencies import get_enhanced_image_service, get_storage_service
 from app.api.router import set_v1_api_version  # Import API versioning function
 from app.api.security import get_api_key
-from app.services.image_service import BaseImageService
-from app.services.storage_service import StorageService
-
-
-@pytest.fixture
-def mock_image_service():
-    """Create a mock image service for testing."""
-    mock_service = MagicMock(spec=BaseImageService)
-    # Set up mock return values
-    mock_service.create_carousel_images.return_value = [
-        {"filename": "slide_1.png", "content": "fake_hex_content"}
-    ]
-    return mock_service
-
-
-@pytest.fixture
-def mock_storage_service():
-    """Create a mock storage service for testing."""
-    mock_service = MagicMock(spec=StorageService)
-    # Set up mock return values
-    mock_service.save_carousel_images.return_value = [
-        "http://test-url.com/temp/test123/slide_1.png"
-    ]
-    # Mock temp directory methods
-    temp_path = Path(tempfile.gettempdir()) / "test_carousel_temp"
-    os.makedirs(temp_path, exist_ok=True)
-    mock_service.temp_dir = temp_path
-    # Mock the get_file_path method to return a Path object that can be patched
-    mock_path = MagicMock(spec=Path)
-    mock_service.get_file_path.return_value = mock_path
-    mock_path.exists.return_value = True
-    mock_path.is_file.return_value = True
-    mock_path.__str__.return_value = str(temp_path / "test123" / "slide_1.png")
-    mock_service.get_content_type.return_value = "image/png"
-    return mock_service
-
-
-@pytest.fixture
-def test_request():
-    """Create a mock request object for testing."""
-    mock_req = MagicMock()
-    mock_req.client = MagicMock()
-    mock_req.client.host = "127.0.0.1"
-    mock_req.method = "POST"
-    mock_req.url = MagicMock()
-    mock_req.url.path = "/api/v1/test"
-    return mock_req
-
-
-@pytest.fixture
-def app():
-    """Get the app instance."""
-    return get_app()
-
-
-@pytest.fixture
-def client_with_mocks(app, mock_image_service, mock_storage_service, test_request):
-    """Create a test client with mocked dependencies."""
-    # Set up dependency overrides
-    app.dependency_overrides = {
-        get_enhanced_image_service: lambda: mock_image_service,
-        get_storage_service: lambda: mock_storage_service,
-        get_api_key: lambda: True,
-        Request: lambda: test_request,  # Mock the Request dependency to fix routing issues
-        set_v1_api_version: lambda: None,  # Mock API versioning function
-    }
-
-    # Create a test client
-    client = TestClient(app)
-
-    yield client
 
-    # Clean up
-    app.dependency_overrides = {}
-
-
-def test_generate_carousel_with_mocked_dependencies(client_with_mocks, mock_image_service):
-    """Test generate carousel endpoint with mocked dependencies."""
-    # Test data following the exact model requirements
-    test_data = {
+# Request body following the exact model requirements, serialized once for every test
+TEST_PAYLOAD_BYTES = json.dumps(
+    {
         "carousel_title": "Test Carousel",
         "slides": [{"text": "Test slide 1"}],
         "include_logo": False,
         "logo_path": None,
         "settings": None,
     }
+).encode()
+JSON_HEADERS = {"content-type": "application/json"}
 
-    # Call the API endpoint
-    response = client_with_mocks.post("/api/v1/generate-carousel", json=test_data)
 
-    # For debugging
-    if response.status_code != 200:
-        print(f"Response: {response.status_code}")
-        print(f"Response JSON: {response.json()}")
+class FakeImageService:
+    """Hand-written image service stand-in exposing only what the endpoints call."""
 
-    # Verify the response
-    assert response.status_code == 200
+    def __init__(self, slides):
+        self.slides = slides
+        self.calls = []
 
+    def create_carousel_images(self, *args, **kwargs):
+        """Record the call and return the canned slides."""
+        self.calls.append((args, kwargs))
+        return self.slides
 
-def test_generate_carousel_with_urls(client_with_mocks, mock_image_service, mock_storage_service):
-    """Test generate carousel with URLs endpoint using mocked dependencies."""
-    # Test data following the exact model requirements
-    test_data = {
-        "carousel_title": "Test Carousel",
-        "slides": [{"text": "Test slide 1"}],
-        "include_logo": False,
-        "logo_path": None,
-        "settings": None,
-    }
 
+@pytest.mark.parametrize(
+    "endpoint, returns_urls",
+    [
+        ("/api/v1/generate-carousel", False),
+        ("/api/v1/generate-carousel-with-urls", True),
+    ],
+)
+def test_generate_carousel_with_mocked_dependencies(client_with_mocks, endpoint, returns_urls):
+    """Test the carousel generation endpoints with mocked dependencies."""
     # Call the API endpoint
-    response = client_with_mocks.post("/api/v1/generate-carousel-with-urls", json=test_data)
+    response = client_with_mocks.post(endpoint, content=TEST_PAYLOAD_BYTES, headers=JSON_HEADERS)
 
-    # For debugging
-    if response.status_code != 200:
-        print(f"Response: {response.status_code}")
-        print(f"Response JSON: {response.json()}")
-
-    # Verify the response
-    assert response.status_code == 200
+    # Verify the response, showing the body if it failed
+    assert response.status_code == 200, response.text
     json_response = response.json()
     assert json_response["status"] == "success"
-    # Instead of checking for an exact URL, just verify it's a list with one item
-    assert len(json_response["public_urls"]) == 1
-    assert isinstance(json_response["public_urls"][0], str)
-
-    # For this test, we just verify the response status, not the mock calls
-    # The internal implementation may use the mocks differently than we expect
 
-
-@pytest.mark.skip(reason="Test needs deeper fixes to file handling logic")
-def test_get_temp_file(app, mock_storage_service, test_request):
-    """Test accessing a temp file with mocked dependencies.
-
-    This test is skipped because it requires deeper fixes to the endpoint's file handling logic.
-    """
-    # Just skip the test completely
-    pytest.skip("This test needs deeper fixes to the endpoint file handling logic")
+    if returns_urls:
+        # Instead of checking for an exact URL, just verify it's a list with one item
+        assert len(json_response["public_urls"]) == 1
+        assert isinstance(json_response["public_urls"][0], str)
 
 
 # This demonstrates how to use dependency overrides for mocking
-def test_alternative_mocking_approach(app, test_request, mock_image_service, mock_storage_service):
+def test_alternative_mocking_approach(
+    app, test_request, mock_image_service, mock_storage_service, monkeypatch
+):
     """Alternative approach to mocking using dependency overrides."""
-    # Setup mock
-    alternative_mock_service = MagicMock(spec=BaseImageService)
-    alternative_mock_service.create_carousel_images.return_value = [
-        {"filename": "slide_1.png", "content": "different_mock_content"}
-    ]
-
-    # Use the app fixture and set overrides
-    app.dependency_overrides = {
-        get_enhanced_image_service: lambda: alternative_mock_service,
+    # Set up a fake; unlike a spec'd mock it has no attributes the endpoint doesn't use
+    fake_image_service = FakeImageService(
+        [{"filename": "slide_1.png", "content": "different_mock_content"}]
+    )
+
+    # Use the app fixture and set overrides; monkeypatch reverts them afterwards
+    overrides = {
+        get_enhanced_image_service: lambda: fake_image_service,
         get_storage_service: lambda: mock_storage_service,
         get_api_key: lambda: True,
         Request: lambda: test_request,  # Mock the Request dependency
         set_v1_api_version: lambda: None,  # Mock API versioning function
     }
+    for dependency, override in overrides.items():
+        monkeypatch.setitem(app.dependency_overrides, dependency, override)
     client = TestClient(app)
 
-    # Test data following the exact model requirements
-    test_data = {
-        "carousel_title": "Alternative Test",
-        "slides": [{"text": "Alternative approach"}],
-        "include_logo": False,
-        "logo_path": None,
-        "settings": None,
-    }
-
     # Call the endpoint
-    response = client.post("/api/v1/generate-carousel", json=test_data)
-
-    # For debugging
-    if response.status_code != 200:
-        print(f"Response: {response.status_code}")
-        print(f"Response JSON: {response.json()}")
-
-    # Verify just the status code
-    assert response.status_code == 200
+    response = client.post(
+        "/api/v1/generate-carousel", content=TEST_PAYLOAD_BYTES, headers=JSON_HEADERS
+    )
 
-    # Verify that our mock was actually used
-    alternative_mock_service.create_carousel_images.assert_called_once()
+    # Verify just the status code, showing the body if it failed
+    assert response.status_code == 200, response.text
 
-    # Clean up
-    app.dependency_overrides = {}
+    # Verify that our fake was actually used
+    assert len(fake_image_service.calls) == 1
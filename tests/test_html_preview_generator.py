@@ -0,0 +1,133 @@
+"""
+Tests for the carousel HTML preview generator.
+
+This module verifies hex and base64 validation, the streamed hex-to-base64
+conversion and the structure of the generated preview document.
+"""
+import base64
+import io
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app_minimal
+from app.utils.html_preview_generator import (
+    generate_html_preview,
+    is_base64,
+    is_hex,
+    write_hex_as_base64,
+)
+
+SLIDE_BYTES = b"\x89PNG test data"
+
+
+@pytest.fixture
+def carousel_data():
+    """Create a minimal API response with one valid and one broken slide."""
+    return {
+        "carousel_id": "test123",
+        "status": "success",
+        "warnings": ["Slide 2 contains non-ASCII characters"],
+        "slides": [
+            {"filename": "slide_1.png", "content": SLIDE_BYTES.hex()},
+            {"filename": "slide_2_error.png", "content": "not hex"},
+        ],
+    }
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        (bytes(range(256)).hex(), True),
+        ("ABCDEF", True),
+        ("", True),
+        ("abc", False),
+        ("xyz0", False),
+        ("not hex", False),
+    ],
+    ids=["bytes", "uppercase", "empty", "odd-length", "non-hex", "text"],
+)
+def test_is_hex(content, expected):
+    """Test that only even-length hex digit strings are accepted."""
+    assert is_hex(content) is expected
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        (base64.b64encode(SLIDE_BYTES).decode("ascii"), True),
+        ("iVBORw0KGgo=", True),
+        ("", True),
+        ("abc", False),
+        ("ab=c", False),
+        ("not base64", False),
+    ],
+    ids=["png-bytes", "padded", "empty", "short", "inner-padding", "text"],
+)
+def test_is_base64(content, expected):
+    """Test that only padded, standard-alphabet base64 strings are accepted."""
+    assert is_base64(content) is expected
+
+
+def test_write_hex_as_base64_streams_in_chunks():
+    """Test that multi-chunk content streams to the same base64 as a one-shot encode."""
+    data = os.urandom(200_000)
+    out = io.StringIO()
+
+    write_hex_as_base64(out, data.hex())
+
+    assert out.getvalue() == base64.b64encode(data).decode("ascii")
+
+
+def test_generate_html_preview(carousel_data, tmp_path):
+    """Test that the preview embeds each slide and reports unavailable images."""
+    output_path = tmp_path / "preview.html"
+
+    result = generate_html_preview(carousel_data, str(output_path))
+
+    assert result == str(output_path)
+    html = output_path.read_text(encoding="utf-8")
+    assert html.rstrip().endswith("</html>")
+    assert "Carousel ID: test123" in html
+    assert "<li>Slide 2 contains non-ASCII characters</li>" in html
+    assert f'base64,{base64.b64encode(SLIDE_BYTES).decode()}"' in html
+    assert '<div class="slide-filename">slide_1.png</div>' in html
+    assert '<div class="slide error-slide" id="slide2">' in html
+    assert "Image data not available" in html
+    assert html.count('class="dot"') == 2
+
+
+def test_generate_html_preview_escapes_text(carousel_data, tmp_path):
+    """Test that user-controlled strings are HTML-escaped in the preview."""
+    carousel_data["carousel_id"] = "<id>"
+    carousel_data["warnings"] = ["<script>alert('x')</script>"]
+    carousel_data["slides"][0]["filename"] = 'a"&b.png'
+    output_path = tmp_path / "preview.html"
+
+    generate_html_preview(carousel_data, str(output_path))
+
+    html = output_path.read_text(encoding="utf-8")
+    assert "<script>alert" not in html
+    assert "<li>&lt;script&gt;alert(&#39;x&#39;)&lt;/script&gt;</li>" in html
+    assert "Carousel ID: &lt;id&gt;" in html
+    assert '<div class="slide-filename">a&quot;&amp;b.png</div>' in html
+
+
+def test_generate_html_preview_from_minimal_api(tmp_path):
+    """Test that a response from the minimal API, with base64 slides, is previewed."""
+    client = TestClient(app_minimal.app)
+    response = client.post(
+        "/api/generate-carousel",
+        json={"carousel_title": "Preview", "slides": [{"text": "One"}, {"text": "Two"}]},
+    )
+    assert response.status_code == 200
+    carousel_data = response.json()
+    output_path = tmp_path / "preview.html"
+
+    generate_html_preview(carousel_data, str(output_path))
+
+    html = output_path.read_text(encoding="utf-8")
+    for slide in carousel_data["slides"]:
+        assert f'base64,{slide["content"]}"' in html
+    assert "Image data not available" not in html
@@ -9,44 +9,17 @@ The tests cover both standard and enhanced implementations of the image service.
 from io import BytesIO
 
 import pytest
-from PIL import Image
+from PIL import Image, ImageDraw
 
 # Import the image service components
-from app.services.image_service import ImageServiceType, get_image_service
-
-
-@pytest.fixture
-def standard_image_service():
-    """Fixture to provide a standard image service for tests."""
-    settings = {
-        "width": 500,  # Smaller size for faster tests
-        "height": 500,
-        "bg_color": (18, 18, 18),
-        "title_font": "Arial.ttf",
-        "text_font": "Arial.ttf",
-        "nav_font": "Arial.ttf",
-    }
-    return get_image_service(ImageServiceType.STANDARD.value, settings)
-
-
-@pytest.fixture
-def enhanced_image_service():
-    """Fixture to provide an enhanced image service for tests."""
-    settings = {
-        "width": 500,  # Smaller size for faster tests
-        "height": 500,
-        "bg_color": (18, 18, 18),
-        "title_font": "Arial.ttf",
-        "text_font": "Arial.ttf",
-        "nav_font": "Arial.ttf",
-    }
-    return get_image_service(ImageServiceType.ENHANCED.value, settings)
-
-
-def test_create_slide_image(enhanced_image_service):
-    """Test the slide image creation functionality."""
+from app.services.image_service import ImageServiceType, base_image_service, get_image_service
+
+
+@pytest.mark.parametrize("service_fixture", ["standard_image_service", "enhanced_image_service"])
+def test_create_slide_image(service_fixture, request):
+    """Test the slide image creation functionality of both implementations."""
     # Create a test image
-    img = enhanced_image_service.create_slide_image(
+    img = request.getfixturevalue(service_fixture).create_slide_image(
         "Test Title", "This is test slide content", 1, 3, False, None
     )
 
@@ -54,36 +27,24 @@ def test_create_slide_image(enhanced_image_service):
     assert img is not None
     assert isinstance(img, Image.Image)
 
-    # Check image dimensions
-    assert img.width == 500  # Should match our fixture settings
-    assert img.height == 500
+    # Check image mode and dimensions
+    assert img.mode in ("RGB", "RGBA")
+    assert img.size == (500, 500)  # Should match our fixture settings
+
+
+def test_slide_png_roundtrip(enhanced_image_service):
+    """Test that a slide encodes to a PNG that decodes back to the same image."""
+    img = enhanced_image_service.create_slide_image("Test Title", "Round trip", 1, 3, False, None)
 
-    # Save to BytesIO to verify it's a valid image
+    # Save to BytesIO and reopen to verify it's a valid image
     buffer = BytesIO()
     img.save(buffer, format="PNG")
     buffer.seek(0)
-
-    # Try to open saved image
     validate_img = Image.open(buffer)
-    assert validate_img is not None
-
-
-def test_create_carousel_images(enhanced_image_service):
-    """Test the carousel images creation functionality."""
-    # Set up test data
-    carousel_title = "Test Carousel"
-    slides_data = [{"text": "This is slide 1"}, {"text": "This is slide 2"}]
-    carousel_id = "test123"
 
-    # Create carousel images
-    result = enhanced_image_service.create_carousel_images(carousel_title, slides_data, carousel_id)
-
-    # Verify results
-    assert len(result) == 2
-    assert "filename" in result[0]
-    assert "content" in result[0]
-    assert result[0]["filename"] == "slide_1.png"
-    assert result[1]["filename"] == "slide_2.png"
+    assert validate_img.format == "PNG"
+    assert validate_img.size == img.size
+    assert validate_img.tobytes() == img.tobytes()
 
 
 def test_error_slide(enhanced_image_service):
@@ -100,47 +61,28 @@ def test_error_slide(enhanced_image_service):
     assert error_slide.height == 500
 
 
-def test_sanitize_text(enhanced_image_service):
-    """Test text sanitization functionality."""
-    # Test with various special characters
-    special_text = "Test with special characters: → ← " " ' ' — – …"
-    sanitized = enhanced_image_service.sanitize_text(special_text)
-
-    # Verify basic sanitization
-    assert "→" not in sanitized
-    assert "->" in sanitized  # Check for replacement
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Arrows: \u2192 \u2190", "Arrows: -> <-"),
+        ("Quotes: \u2018a\u2019 \u201cb\u201d", "Quotes: 'a' \"b\""),
+        ("Dashes: \u2014 \u2013 \u2026", "Dashes: - - ..."),
+        (None, ""),
+        (123, "123"),
+    ],
+    ids=["arrows", "quotes", "dashes", "none", "non-string"],
+)
+def test_sanitize_text(enhanced_image_service, text, expected):
+    """Test text sanitization of special characters and non-string input."""
+    assert enhanced_image_service.sanitize_text(text) == expected
 
-    # Test with None input
-    assert enhanced_image_service.sanitize_text(None) == ""
 
-    # Test with non-string input
-    assert isinstance(enhanced_image_service.sanitize_text(123), str)
+def test_sanitize_text_cache_respects_ascii_only(standard_image_service):
+    """Test that cached sanitization results are not shared across ascii_only settings."""
+    ascii_service = get_image_service(ImageServiceType.STANDARD.value, {"ascii_only": True})
 
-
-def test_compare_service_implementations(standard_image_service, enhanced_image_service):
-    """Test that both service implementations produce valid images."""
-    # Test parameters
-    title = "Test Title"
-    text = "This is test content"
-    slide_number = 1
-    total_slides = 3
-
-    # Create images with both services
-    standard_img = standard_image_service.create_slide_image(
-        title, text, slide_number, total_slides, False, None
-    )
-
-    enhanced_img = enhanced_image_service.create_slide_image(
-        title, text, slide_number, total_slides, False, None
-    )
-
-    # Verify both are valid images
-    assert isinstance(standard_img, Image.Image)
-    assert isinstance(enhanced_img, Image.Image)
-
-    # They should have the same dimensions as specified in the fixtures
-    assert standard_img.width == enhanced_img.width == 500
-    assert standard_img.height == enhanced_img.height == 500
+    assert standard_image_service.sanitize_text("caf\u00e9") == "cafe\u0301"
+    assert ascii_service.sanitize_text("caf\u00e9") == "cafe"
 
 
 def test_unicode_text_handling(enhanced_image_service):
@@ -152,27 +94,182 @@ def test_unicode_text_handling(enhanced_image_service):
     img = enhanced_image_service.create_slide_image("Unicode Test", unicode_text, 1, 1, False, None)
 
     # Verify image was created
-    assert img is not None
     assert isinstance(img, Image.Image)
+    assert img.size == (500, 500)
+
+
+def test_safe_load_font_reuses_cached_font(enhanced_image_service):
+    """Test that repeated font loads for the same path and size share one object."""
+    first = enhanced_image_service.safe_load_font("DejaVuSans.ttf", 48)
+    second = enhanced_image_service.safe_load_font("DejaVuSans.ttf", 48)
+
+    assert first is second
+
+
+def test_safe_load_font_caches_fallback_resolution(enhanced_image_service):
+    """Test that a missing font resolves to the same fallback on repeated requests."""
+    first = enhanced_image_service.safe_load_font("missing-font.ttf", 30)
+    second = enhanced_image_service.safe_load_font("missing-font.ttf", 30)
+
+    assert first is second
+
+
+def test_gradient_text_render_is_reused(enhanced_image_service):
+    """Test that rendering the same title twice yields equal but independent images."""
+    img = Image.new("RGB", (500, 500))
+    draw = ImageDraw.Draw(img)
+    font = enhanced_image_service.safe_load_font("DejaVuSans.ttf", 48)
+
+    first, first_pos = enhanced_image_service.create_gradient_text(
+        draw, "Repeated Title", (250, 150), font, 500
+    )
+    second, second_pos = enhanced_image_service.create_gradient_text(
+        draw, "Repeated Title", (250, 150), font, 500
+    )
+
+    assert first is not second
+    assert first.tobytes() == second.tobytes()
+    assert first_pos == second_pos
+
+
+def test_large_gradient_text_render_bypasses_cache(enhanced_image_service, monkeypatch):
+    """Test that renders over the cache's size limit are rasterized directly."""
+
+    def fail_cached_render(*args):
+        raise AssertionError("large render should not go through the cache")
+
+    monkeypatch.setattr(base_image_service, "_render_gradient_text", fail_cached_render)
+    font = enhanced_image_service.safe_load_font("DejaVuSans.ttf", 48)
+    # 1000 x 200 x 4 bytes is well over MAX_CACHED_RENDER_BYTES
+    img = base_image_service.render_gradient_text_image(
+        "Long title", font, 1000, 200, [(40, 100, 255), (255, 255, 255)]
+    )
+
+    assert img.mode == "RGBA"
+    assert img.size == (1000, 200)
+    assert img.getchannel("A").getextrema()[1] > 0
 
-    # Save and verify it's a valid image
-    buffer = BytesIO()
-    img.save(buffer, format="PNG")
-    buffer.seek(0)
-    validate_img = Image.open(buffer)
-    assert validate_img is not None
 
+def test_long_text_sanitize_bypasses_cache(enhanced_image_service, monkeypatch):
+    """Test that text over the sanitize cache's length limit is not memoized."""
 
-def test_error_handling_with_problematic_text(enhanced_image_service):
-    """Test error handling with potentially problematic text."""
-    # Create a very long text that might cause issues
-    very_long_text = "This is an extremely long text " * 100
+    def fail_cached_sanitize(*args):
+        raise AssertionError("long text should not go through the cache")
 
-    # The service should handle this gracefully
+    monkeypatch.setattr(base_image_service, "_sanitize_text_cached", fail_cached_sanitize)
+    text = "\u201cQuoted\u201d caf\u00e9 " * 40
+
+    result = enhanced_image_service.sanitize_text(text)
+
+    assert len(text) > base_image_service.MAX_CACHED_SANITIZE_CHARS
+    assert result.startswith('"Quoted" cafe')
+
+
+def test_create_slide_image_with_logo(enhanced_image_service, tmp_path):
+    """Test that a logo is composited onto the slide and reused across slides."""
+    logo_path = tmp_path / "logo.png"
+    Image.new("RGBA", (200, 200), (255, 0, 0, 255)).save(logo_path)
+
+    first = enhanced_image_service.create_slide_image("", "Text", 1, 2, True, str(logo_path))
+    second = enhanced_image_service.create_slide_image("", "Text", 2, 2, True, str(logo_path))
+
+    # Logo is 10% of the width, placed 30px from the bottom-left corner
+    assert first.getpixel((40, 500 - 40)) == (255, 0, 0)
+    assert second.getpixel((40, 500 - 40)) == (255, 0, 0)
+
+
+def test_create_slides_batch_preserves_order(enhanced_image_service):
+    """Test that batch slide creation returns one image per spec, in order."""
+    specs = [
+        {"title": None, "text": f"Slide {i}", "slide_number": i, "total_slides": 3}
+        for i in range(1, 4)
+    ]
+
+    images = enhanced_image_service.create_slides_batch(specs)
+    expected = [enhanced_image_service.create_slide_image(**spec) for spec in specs]
+
+    assert len(images) == 3
+    for image, reference in zip(images, expected):
+        assert image.tobytes() == reference.tobytes()
+
+
+def test_gradient_text_background_is_transparent(enhanced_image_service):
+    """Test that only the glyphs carry alpha; the text box background stays clear."""
+    draw = ImageDraw.Draw(Image.new("RGB", (500, 500)))
+    font = enhanced_image_service.safe_load_font("DejaVuSans.ttf", 48)
+
+    text_img, _ = enhanced_image_service.create_gradient_text(draw, "I I", (250, 150), font, 500)
+
+    alpha = text_img.getchannel("A")
+    assert alpha.getextrema()[1] > 0
+    # The gap between the two glyphs must remain fully transparent
+    assert alpha.getpixel((text_img.width // 2, text_img.height // 2)) == 0
+
+
+def test_line_height_uses_font_metrics(enhanced_image_service):
+    """Test that line height follows the font metrics rather than a fixed value."""
+    font = enhanced_image_service.safe_load_font("DejaVuSans.ttf", 48)
+    ascent, descent = font.getmetrics()
+
+    assert enhanced_image_service._get_line_height(font) == ascent + descent
+
+
+def test_wide_title_is_clipped_not_dropped(enhanced_image_service, caplog):
+    """Test that a title wider than the slide is composited without falling back."""
     img = enhanced_image_service.create_slide_image(
-        "Long Text Test", very_long_text, 1, 1, False, None
+        "An extremely long carousel title that overflows", "Body", 1, 1, False, None
     )
 
-    # Verify image was created despite the challenging input
-    assert img is not None
-    assert isinstance(img, Image.Image)
+    assert img.mode == "RGB"
+    assert img.size == (500, 500)
+    assert "Error creating gradient title" not in caplog.text
+
+
+def test_gradient_mask_ramps_across_columns(enhanced_image_service):
+    """Test that the gradient mask interpolates per column and repeats down each row."""
+    mask = enhanced_image_service._create_gradient_mask(4, 3, [(0, 0, 0), (240, 240, 240)])
+
+    assert mask.mode == "L"
+    assert mask.size == (4, 3)
+    assert list(mask.getdata()) == [0, 60, 120, 180] * 3
+
+
+def test_non_ascii_filter_keeps_renderable_categories(enhanced_image_service):
+    """Test that only non-ASCII characters from unrenderable categories are replaced."""
+    text = "caf\u00e9 \u65e5\u672c e\u0301 zero\u200bwidth \U0001f600\ttab"
+
+    assert enhanced_image_service._handle_non_ascii_chars(text) == (
+        "caf\u00e9 \u65e5\u672c e? zero?width \U0001f600\ttab"
+    )
+
+
+def test_wrap_error_text_limits_line_length(enhanced_image_service):
+    """Test that error details wrap into short lines without losing words."""
+    text = "codec can't encode character '\\u2192' in position 12: ordinal not in range(128)"
+
+    lines = enhanced_image_service._wrap_error_text(text)
+
+    assert len(lines) == 2
+    assert all(len(line) < 50 for line in lines)
+    assert " ".join(lines) == text
+
+
+def test_gradient_masks_with_same_palette_match(enhanced_image_service):
+    """Test that masks built from the same palette and width are byte-identical."""
+    colors = [(10, 20, 30), (200, 210, 220)]
+
+    first = enhanced_image_service._create_gradient_mask(123, 10, colors)
+    second = enhanced_image_service._create_gradient_mask(123, 10, colors)
+
+    assert first is not second
+    assert first.tobytes() == second.tobytes()
+
+
+def test_canvas_copies_are_independent(enhanced_image_service):
+    """Test that canvases built from the shared template do not affect each other."""
+    first = enhanced_image_service._create_canvas(20, 20, [18, 18, 18])
+    first.putpixel((0, 0), (255, 0, 0, 255))
+
+    second = enhanced_image_service._create_canvas(20, 20, (18, 18, 18))
+
+    assert second.getpixel((0, 0)) == (18, 18, 18, 255)
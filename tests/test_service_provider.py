@@ -4,6 +4,7 @@ Tests for the service provider dependency injection system.
 This module tests the functionality of the service provider pattern
 and dependency injection system implemented in the application.
 """
+import itertools
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -69,13 +70,11 @@ class TestServiceProvider:
 
     def test_register_transient_service(self, empty_provider, test_service):
         """Test registering a transient service."""
-        # Create a factory function
-        counter = 0
+        # Create a factory function that numbers each instance it builds
+        next_id = itertools.count(1).__next__
 
         def factory():
-            nonlocal counter
-            counter += 1
-            return test_service(f"test_transient_{counter}")
+            return test_service(f"test_transient_{next_id()}")
 
         # Register the service
         empty_provider.register(test_service, factory, singleton=False)
@@ -124,9 +123,7 @@ class TestServiceProvider:
         # Register two services with the same type but different keys
         empty_provider.register(test_service, lambda: test_service("service1"), singleton=True)
         # Now manually register another service with a different key
-        if test_service not in empty_provider._services:
-            empty_provider._services[test_service] = {}
-        empty_provider._services[test_service]["service2"] = {
+        empty_provider._services.setdefault(test_service, {})["service2"] = {
             "factory": lambda: test_service("service2"),
             "singleton": True,
         }
@@ -5,23 +5,21 @@ This module contains tests that verify the storage service's
 interaction with the file system.
 """
 import os
-import shutil
-import tempfile
-from datetime import datetime
-from pathlib import Path
-from unittest.mock import MagicMock
+import time
+from datetime import datetime, timedelta
 
 import pytest
 from fastapi import BackgroundTasks
 
-from app.services.storage_service import StorageService
+from app.services.storage_service import WRITE_CHUNK_SIZE, StorageService, _parse_cleanup_time
 
 
 @pytest.fixture
-def temp_test_dir():
-    """Create a temporary directory for testing file operations."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        yield Path(temp_dir)
+def temp_test_dir(tmp_path):
+    """Provide a temporary directory for testing file operations."""
+    # pytest creates tmp_path under its session base directory and prunes old
+    # runs itself, so there is no per-test rmtree
+    return tmp_path
 
 
 @pytest.fixture
@@ -53,15 +51,9 @@ class TestStorageServiceFileSystem:
         # Test directory creation
         carousel_id = "test123"
 
-        # Make sure temp_dir exists first - this is normally initialized in __init__
-        os.makedirs(test_storage_service.temp_dir, exist_ok=True)
-
+        # temp_dir is pytest's tmp_path, which already exists and starts empty
         carousel_dir = test_storage_service.temp_dir / carousel_id
 
-        # Ensure directory doesn't exist at start
-        if carousel_dir.exists():
-            shutil.rmtree(carousel_dir)
-
         assert not carousel_dir.exists()
 
         # Create it using the service's directory creation method
@@ -77,9 +69,6 @@ class TestStorageServiceFileSystem:
         carousel_id = "save_test"
         base_url = "http://test-url.com"
 
-        # Make sure temp_dir exists first
-        os.makedirs(test_storage_service.temp_dir, exist_ok=True)
-
         # Save the images
         urls = test_storage_service.save_carousel_images(
             carousel_id, test_carousel_images, base_url
@@ -103,6 +92,38 @@ class TestStorageServiceFileSystem:
             # Verify file has content
             assert filepath.stat().st_size > 0
 
+    def test_save_carousel_images_accepts_raw_bytes(self, test_storage_service):
+        """Test that raw bytes content is written without hex decoding."""
+        content = b"\x89PNG\r\n\x1a\n" + bytes(range(256))
+        images = [{"filename": "slide_1.png", "content": content}]
+
+        urls = test_storage_service.save_carousel_images("bytes_test", images, "http://test")
+
+        assert len(urls) == 1
+        saved = test_storage_service.temp_dir / "bytes_test" / "slide_1.png"
+        assert saved.read_bytes() == content
+
+    def test_save_carousel_images_parallel(self, test_storage_service):
+        """Test that more images than write workers are all saved, with URLs in order."""
+        images = [{"filename": f"slide_{i}.png", "content": bytes([i]) * 64} for i in range(1, 17)]
+
+        urls = test_storage_service.save_carousel_images("parallel_test", images, "http://test")
+
+        assert [url.rsplit("/", 1)[-1] for url in urls] == [img["filename"] for img in images]
+        carousel_dir = test_storage_service.temp_dir / "parallel_test"
+        for img in images:
+            assert (carousel_dir / img["filename"]).read_bytes() == img["content"]
+
+    def test_save_carousel_images_large_payload(self, test_storage_service):
+        """Test that payloads larger than one write chunk are saved intact."""
+        content = os.urandom(WRITE_CHUNK_SIZE + 12345)
+        images = [{"filename": "large.png", "content": content}]
+
+        test_storage_service.save_carousel_images("large_test", images, "http://test")
+
+        saved = test_storage_service.temp_dir / "large_test" / "large.png"
+        assert saved.read_bytes() == content
+
     def test_get_file_path(self, test_storage_service):
         """Test retrieving file paths."""
         carousel_id = "path_test"
@@ -110,7 +131,7 @@ class TestStorageServiceFileSystem:
 
         # Create the directory and an empty file
         carousel_dir = test_storage_service.temp_dir / carousel_id
-        os.makedirs(carousel_dir, exist_ok=True)
+        carousel_dir.mkdir()
 
         filepath = carousel_dir / filename
         with open(filepath, "w") as f:
@@ -123,6 +144,10 @@ class TestStorageServiceFileSystem:
         assert result_path == filepath
         assert result_path.exists()
 
+        # Missing files and directories are not returned
+        assert test_storage_service.get_file_path(carousel_id, "missing.png") is None
+        assert test_storage_service.get_file_path("", carousel_id) is None
+
     def test_get_content_type(self, test_storage_service):
         """Test content type determination."""
         # Test various file extensions
@@ -130,6 +155,8 @@ class TestStorageServiceFileSystem:
         assert "image/jpeg" in test_storage_service.get_content_type("photo.jpg")
         assert "image/jpeg" in test_storage_service.get_content_type("photo.jpeg")
         assert "image/svg+xml" in test_storage_service.get_content_type("vector.svg")
+        assert "image/gif" in test_storage_service.get_content_type("anim.GIF")
+        assert "image/webp" in test_storage_service.get_content_type("slide.v2.webp")
         assert "application/octet-stream" in test_storage_service.get_content_type("unknown.xyz")
 
     def test_cleanup_old_files(self, test_storage_service):
@@ -137,7 +164,7 @@ class TestStorageServiceFileSystem:
         # Create some test directories with files
         for carousel_id in ["old1", "old2", "old3"]:
             carousel_dir = test_storage_service.temp_dir / carousel_id
-            os.makedirs(carousel_dir, exist_ok=True)
+            carousel_dir.mkdir()
 
             # Create a test file
             with open(carousel_dir / "test.txt", "w") as f:
@@ -157,18 +184,47 @@ class TestStorageServiceFileSystem:
         # Verify directories were removed
         assert after_count < initial_count
 
-    def test_schedule_cleanup(self, test_storage_service):
+    def test_cleanup_respects_scheduled_time(self, test_storage_service):
+        """Test that directories with a future cleanup time are kept."""
+        scheduled_dir = test_storage_service.temp_dir / "scheduled"
+        expired_dir = test_storage_service.temp_dir / "expired"
+        scheduled_dir.mkdir()
+        expired_dir.mkdir()
+
+        test_storage_service.schedule_cleanup(BackgroundTasks(), scheduled_dir)
+
+        test_storage_service.cleanup_old_files(hours=0)
+
+        assert scheduled_dir.exists()
+        assert not expired_dir.exists()
+
+    def test_cleanup_removes_nested_directories(self, test_storage_service):
+        """Test that expired directories with subdirectories are still removed."""
+        carousel_dir = test_storage_service.temp_dir / "nested"
+        (carousel_dir / "extra").mkdir(parents=True)
+        (carousel_dir / "slide_1.png").write_bytes(b"png")
+        (carousel_dir / "extra" / "note.txt").write_text("x")
+
+        test_storage_service.cleanup_old_files(hours=0)
+
+        assert not carousel_dir.exists()
+
+    def test_schedule_cleanup(self, test_storage_service, monkeypatch):
         """Test scheduling cleanup as a background task."""
-        # Create a mock background tasks
-        mock_tasks = MagicMock(spec=BackgroundTasks)
+        # Freeze the clock so the scheduled time can be checked exactly
+        fixed_now = 1_700_000_000.0
+        monkeypatch.setattr(time, "time", lambda: fixed_now)
+
+        # A real, empty task list; schedule_cleanup only records the time on disk
+        tasks = BackgroundTasks()
 
         # Schedule cleanup
         carousel_dir = test_storage_service.temp_dir / "cleanup_test"
         # Create the directory first to avoid file not found errors
-        os.makedirs(carousel_dir, exist_ok=True)
+        carousel_dir.mkdir()
 
         # Now schedule the cleanup
-        test_storage_service.schedule_cleanup(mock_tasks, carousel_dir, hours=24)
+        test_storage_service.schedule_cleanup(tasks, carousel_dir, hours=24)
 
         # Verify the cleanup file was created
         cleanup_file = carousel_dir / ".cleanup"
@@ -178,10 +234,29 @@ class TestStorageServiceFileSystem:
         with open(cleanup_file, "r") as f:
             timestamp = f.read().strip()
 
-        # Verify the timestamp is in ISO format
+        # Verify the timestamp is integer epoch seconds
         try:
-            cleanup_time = datetime.fromisoformat(timestamp)
-            # Verify it's in the future
-            assert cleanup_time > datetime.now()
+            cleanup_time = int(timestamp)
         except ValueError:
-            pytest.fail(f"Cleanup file does not contain a valid ISO timestamp: {timestamp}")
+            pytest.fail(f"Cleanup file does not contain epoch seconds: {timestamp}")
+        # Verify it's exactly 24 hours after the frozen time
+        assert cleanup_time == int(fixed_now) + 24 * 3600
+
+    def test_cleanup_accepts_legacy_iso_timestamp(self, test_storage_service):
+        """Test that .cleanup files written in ISO-8601 format are still honoured."""
+        carousel_dir = test_storage_service.temp_dir / "legacy"
+        carousel_dir.mkdir()
+        (carousel_dir / ".cleanup").write_text((datetime.now() + timedelta(hours=1)).isoformat())
+
+        test_storage_service.cleanup_old_files(hours=0)
+
+        assert carousel_dir.exists()
+
+
+def test_parse_cleanup_time_returns_float():
+    """Test that both epoch and ISO-8601 cleanup times parse to float seconds."""
+    epoch = _parse_cleanup_time("1700000000\n")
+    iso = _parse_cleanup_time(datetime.fromtimestamp(1_700_000_000).isoformat())
+
+    assert isinstance(epoch, float) and epoch == 1_700_000_000.0
+    assert isinstance(iso, float) and iso == 1_700_000_000.0